@@ -51,11 +51,15 @@ case $choice in
         serverless deploy
         ;;
     2)
-        echo "📦 Deploying with AWS SAM..."
+        echo "📦 Deploying with AWS SAM (container image)..."
         if ! command -v sam &> /dev/null; then
             echo "❌ AWS SAM CLI not found. Please install it first."
             exit 1
         fi
+        if ! command -v docker &> /dev/null; then
+            echo "❌ Docker not found. It is required to build the Lambda container image."
+            exit 1
+        fi
         sam build
         sam deploy --guided
         ;;
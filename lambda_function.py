@@ -4,62 +4,329 @@ AWS Lambda function for Stale MR Reminder Bot
 Runs daily at 5 PM IST to send Slack notifications for stale merge requests
 """
 
+import functools
+import importlib
 import json
 import logging
-from mr_reminder_core import main as run_mr_reminder
+import os
+import time
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; fall back to the stdlib encoder
+    orjson = None
+
+# Level and format come from the Lambda runtime (AWS_LAMBDA_LOG_LEVEL /
+# logging config on the function), so the root logger is left untouched
+logger = logging.getLogger(__name__)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+# Response bodies rendered once at import; only the request id (a UUID, no
+# escaping needed) and the JSON-encoded error string are substituted per call
+_OK_BODY = '{"message":"Stale MR reminder executed successfully","timestamp":"%s"}'
+_TRANSIENT_BODY = '{"error":%s,"message":"MR reminder completed with transient failures","timestamp":"%s"}'
+_ERROR_BODY = '{"error":%s,"message":"Failed to execute MR reminder","timestamp":"%s"}'
+_DUPLICATE_BODY = '{"message":"Duplicate event skipped","timestamp":"%s"}'
+
+# Idempotency: event ids already handled (or in flight) in this container.
+# When IDEMPOTENCY_TABLE is set, a DynamoDB record also catches retries that
+# land on a different container. The record is IN_PROGRESS until the run
+# succeeds; if the run dies without releasing it (timeout, crash), the claim
+# lapses when the invocation's time is up, so the retry is processed.
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+STATUS_IN_PROGRESS = "IN_PROGRESS"
+STATUS_COMPLETED = "COMPLETED"
+_MAX_CLAIMED_EVENTS = 1024
+_claimed_events = {}
+
+
+# Cached entry point of mr_reminder_core; populated on first use so that the
+# INIT phase does not pay for importing requests/yaml and the core module.
+_run_mr_reminder = None
+# Expected/retryable errors raised by the core; filled in once it is imported
+_TRANSIENT_ERRORS = ()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_core():
+    """Import mr_reminder_core once per container and return the module"""
+    global _TRANSIENT_ERRORS
+    core = importlib.import_module("mr_reminder_core")
+    _TRANSIENT_ERRORS = (core.TransientMRError,)
+    return core
+
+
+# Clients and parsed config shared across warm invocations of this container
+_CLIENTS = {}
+
+
+def _init_clients():
+    """Build the JIRA client and load the team config once per container"""
+    core = _load_core()
+    jira_client = core.build_jira_client()
+    config = core.load_projects_config()
+    _CLIENTS.update(jira=jira_client, config=config)
+
+
+def get_clients() -> dict:
+    """Return the cached clients, initializing them on first use"""
+    if not _CLIENTS:
+        _init_clients()
+    return _CLIENTS
+
+
+@functools.lru_cache(maxsize=1)
+def _get_lambda_client():
+    """boto3 Lambda client, only needed (and imported) in dispatch mode"""
+    import boto3
+    return boto3.client("lambda")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sqs_client():
+    """boto3 SQS client, used in dispatch mode when MR_REMINDER_QUEUE_URL is set"""
+    import boto3
+    return boto3.client("sqs")
+
+
+def _dispatch_teams(teams_data: dict, context, event_id: str = None) -> int:
+    """Fan out one 'process' job per team
+
+    Jobs go to the MR_REMINDER_QUEUE_URL SQS queue when configured, otherwise
+    they are asynchronous invocations of this function. Each job carries an id
+    derived from the dispatching event, so a retried dispatch does not notify
+    the same team twice.
+    """
+    queue_url = os.environ.get("MR_REMINDER_QUEUE_URL")
+    team_names = _load_core().get_team_names(teams_data)
+    for team_name in team_names:
+        payload = {"mode": "process", "teams": [team_name]}
+        if event_id:
+            payload["id"] = f"{event_id}:{team_name}"
+        if queue_url:
+            _get_sqs_client().send_message(QueueUrl=queue_url, MessageBody=_dumps(payload))
+        else:
+            _get_lambda_client().invoke(
+                FunctionName=context.invoked_function_arn,
+                InvocationType="Event",
+                Payload=_dumps(payload),
+            )
+    return len(team_names)
+
+
+def _handle_sqs_batch(event, context) -> dict:
+    """Run each queued job through lambda_handler and report failed messages"""
+    failures = []
+    for record in event["Records"]:
+        try:
+            job = json.loads(record["body"])
+        except ValueError:
+            job = None
+        if not isinstance(job, dict):
+            logger.error("Dropping malformed job message %s", record.get("messageId"))
+            continue
+        response = lambda_handler(job, context)
+        if response["statusCode"] >= 500:
+            failures.append({"itemIdentifier": record["messageId"]})
+    return {"batchItemFailures": failures}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_dynamodb_client():
+    """boto3 DynamoDB client, only used when IDEMPOTENCY_TABLE is configured"""
+    import boto3
+    return boto3.client("dynamodb")
+
+
+def _claim_event(event_id: str, context) -> bool:
+    """Mark event_id as being processed; False if it was already claimed
+
+    A DynamoDB record can be taken over once it has expired, or while it is
+    still IN_PROGRESS past the deadline of the invocation that wrote it.
+    """
+    if event_id in _claimed_events:
+        return False
+    table = os.environ.get("IDEMPOTENCY_TABLE")
+    if table:
+        dynamodb = _get_dynamodb_client()
+        now = time.time()
+        now_ms = int(now * 1000)
+        try:
+            dynamodb.put_item(
+                TableName=table,
+                Item={
+                    "id": {"S": event_id},
+                    "status": {"S": STATUS_IN_PROGRESS},
+                    "in_progress_expiry": {"N": str(now_ms + context.get_remaining_time_in_millis())},
+                    "expiration": {"N": str(int(now) + IDEMPOTENCY_TTL_SECONDS)},
+                },
+                ConditionExpression=(
+                    "attribute_not_exists(id) OR expiration < :now"
+                    " OR (#status = :in_progress AND in_progress_expiry < :now_ms)"
+                ),
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":now": {"N": str(int(now))},
+                    ":now_ms": {"N": str(now_ms)},
+                    ":in_progress": {"S": STATUS_IN_PROGRESS},
+                },
+            )
+        except dynamodb.exceptions.ConditionalCheckFailedException:
+            return False
+    if len(_claimed_events) >= _MAX_CLAIMED_EVENTS:
+        _claimed_events.pop(next(iter(_claimed_events)))
+    _claimed_events[event_id] = True
+    return True
+
+
+def _complete_event(event_id: str):
+    """Mark a claimed event as done, so later retries of it are skipped for good"""
+    table = os.environ.get("IDEMPOTENCY_TABLE")
+    if table:
+        try:
+            _get_dynamodb_client().update_item(
+                TableName=table,
+                Key={"id": {"S": event_id}},
+                UpdateExpression="SET #status = :completed REMOVE in_progress_expiry",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":completed": {"S": STATUS_COMPLETED}},
+            )
+        except Exception as e:
+            logger.warning("Failed to mark idempotency record %s completed: %s", event_id, e)
+
+
+def _release_event(event_id: str):
+    """Drop the claim on a failed event so that its retry is processed"""
+    _claimed_events.pop(event_id, None)
+    table = os.environ.get("IDEMPOTENCY_TABLE")
+    if table:
+        try:
+            _get_dynamodb_client().delete_item(TableName=table, Key={"id": {"S": event_id}})
+        except Exception as e:
+            logger.warning("Failed to release idempotency record %s: %s", event_id, e)
+
+
+# Every real invocation needs the core, so on Lambda it is imported (and the
+# shared HTTP session created) during INIT, where it is paid once per
+# environment; importing this module elsewhere (tests, local runs) stays lazy.
+# Provisioned-concurrency environments run INIT ahead of any traffic, so they
+# also build the JIRA client and load the config there.
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    try:
+        _run_mr_reminder = _load_core().main
+        _load_core().get_session()
+        if os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency":
+            get_clients()
+    except Exception as e:
+        logger.warning("Deferring client initialization to first invocation: %s", e)
 
-# Configure logging for Lambda
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
     """
     AWS Lambda handler function
     
     Args:
-        event: Lambda event data (from EventBridge/CloudWatch Events)
+        event: Lambda event data (from EventBridge/CloudWatch Events).
+            {"mode": "dispatch"} fans out one job per team;
+            {"mode": "process", "teams": [...]} handles only those teams;
+            SQS batches of such jobs are processed record by record;
+            any other event processes every team inline.
         context: Lambda context object
         
     Returns:
         dict: Response with status code and message
     """
+    global _run_mr_reminder
+    # Scheduled warm-up pings only keep the container hot; skip the real work
+    if event.get("warmer") is True or event.get("source") == "warmer":
+        logger.info("warmup ping")
+        return {"statusCode": 200, "body": "warm"}
+
+    if "Records" in event:
+        return _handle_sqs_batch(event, context)
+
+    event_id = event.get("id")
+    # Set once this invocation owns the event id; only then is it released on failure
+    claimed = False
     try:
         logger.info("Starting Stale MR Reminder Lambda execution")
-        logger.info(f"Event: {json.dumps(event)}")
+        logger.info("event received", extra={
+            "event_source": event.get("source"),
+            "detail_type": event.get("detail-type"),
+        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("full event: %s", _dumps(event))
+
+        if event_id:
+            if not _claim_event(event_id, context):
+                logger.info("Skipping duplicate event %s", event_id)
+                return {
+                    'statusCode': 200,
+                    'body': _DUPLICATE_BODY % context.aws_request_id
+                }
+            claimed = True
         
+        if _run_mr_reminder is None:
+            _run_mr_reminder = _load_core().main
+
+        clients = get_clients()
+        mode = event.get("mode")
+
+        if mode == "dispatch":
+            dispatched = _dispatch_teams(clients["config"], context, event_id)
+            logger.info("Dispatched %d team job(s)", dispatched)
+            if claimed:
+                _complete_event(event_id)
+            return {
+                'statusCode': 202,
+                'body': _dumps({
+                    'message': f'Dispatched {dispatched} team job(s)',
+                    'timestamp': context.aws_request_id
+                })
+            }
+
         # Run the main MR reminder logic
-        run_mr_reminder()
+        _run_mr_reminder(
+            jira_client=clients["jira"],
+            teams_data=clients["config"],
+            parallel_slack=True,
+            team_names=event.get("teams") if mode == "process" else None,
+        )
         
         logger.info("Successfully completed MR reminder execution")
+        if claimed:
+            _complete_event(event_id)
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Stale MR reminder executed successfully',
-                'timestamp': context.aws_request_id
-            })
+            'body': _OK_BODY % context.aws_request_id
         }
         
+    except _TRANSIENT_ERRORS as e:
+        # Expected failure: log without the traceback formatting cost
+        logger.warning("transient: %s", e)
+        if claimed:
+            _release_event(event_id)
+
+        return {
+            'statusCode': 503,
+            'body': _TRANSIENT_BODY % (_dumps(str(e)), context.aws_request_id)
+        }
+
     except Exception as e:
-        logger.error(f"Error in lambda execution: {str(e)}", exc_info=True)
+        logger.error("Error in lambda execution: %s", e, exc_info=True)
+        if claimed:
+            _release_event(event_id)
         
         return {
             'statusCode': 500,
-            'body': json.dumps({
-                'error': str(e),
-                'message': 'Failed to execute MR reminder',
-                'timestamp': context.aws_request_id
-            })
+            'body': _ERROR_BODY % (_dumps(str(e)), context.aws_request_id)
         }
 
-
-# For local testing
-if __name__ == "__main__":
-    # Mock Lambda context for local testing
-    class MockContext:
-        aws_request_id = "local-test-12345"
-        
-    # Test the lambda function
-    test_event = {"source": "aws.events", "detail-type": "Scheduled Event"}
-    result = lambda_handler(test_event, MockContext())
-    print(f"Local test result: {result}")
\ No newline at end of file
@@ -0,0 +1,19 @@
+# local_invoke.py - Run the Lambda handler locally
+"""
+Invokes lambda_function.lambda_handler with a mock context and a scheduled event.
+Not part of the deployment package.
+"""
+
+from lambda_function import lambda_handler
+
+
+# Mock Lambda context for local testing
+class MockContext:
+    aws_request_id = "local-test-12345"
+
+
+if __name__ == "__main__":
+    # Test the lambda function
+    test_event = {"source": "aws.events", "detail-type": "Scheduled Event"}
+    result = lambda_handler(test_event, MockContext())
+    print(f"Local test result: {result}")
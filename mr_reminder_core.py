@@ -5,14 +5,38 @@ Sends daily Slack notifications for merge requests pending review for more than
 Multi-project support with priority-based thresholds
 """
 
+import json
 import os
 import requests
-import json
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
 from typing import List, Dict, Optional
+from urllib.parse import parse_qs, urlparse
 import logging
+import re
+import threading
+import time
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; fall back to the stdlib decoder
+    orjson = None
+
+try:
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:  # optional accelerator; Python 3.11+ parses GitLab's trailing Z itself
+    parse_iso_datetime = datetime.fromisoformat
+
+try:
+    from yaml import CSafeLoader as YAMLSafeLoader
+except ImportError:  # PyYAML built without libyaml; use the pure-Python loader
+    from yaml import SafeLoader as YAMLSafeLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,11 +44,138 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Slack webhook posts when notifications are sent in
+# parallel (one webhook per team, so this never floods a single channel)
+SLACK_MAX_WORKERS = 20
+
+# Upper bound on concurrent GitLab/JIRA requests while collecting a team's MRs.
+# Teams are analyzed concurrently, so the process-wide caps below are what keep
+# each host within the session's connection pool (pool_maxsize=32)
+FETCH_MAX_WORKERS = 8
+
+# Upper bound on teams analyzed concurrently by main(); each team fans out its
+# own project fetches, which the GitLab request cap below still bounds
+TEAM_MAX_WORKERS = 8
+
+# Pools nest (teams -> projects -> pages), so in-flight GitLab requests are capped
+# process-wide as well, keeping bursts under GitLab's per-user rate limit
+GITLAB_MAX_CONCURRENT_REQUESTS = 16
+_gitlab_request_slots = threading.BoundedSemaphore(GITLAB_MAX_CONCURRENT_REQUESTS)
+
+# Same for JIRA: per-ticket fallback lookups of all teams would otherwise reach
+# TEAM_MAX_WORKERS x FETCH_MAX_WORKERS = 64 in-flight requests
+JIRA_MAX_CONCURRENT_REQUESTS = 16
+_jira_request_slots = threading.BoundedSemaphore(JIRA_MAX_CONCURRENT_REQUESTS)
+
+# Approval results memoized at module scope so that repeated runs within a warm
+# container skip the /approvals call for MRs that have not changed since.
+# Keyed by (project_id, mr_iid, updated_at) -> (approved, monotonic timestamp).
+APPROVAL_CACHE_TTL_SECONDS = 300
+APPROVAL_CACHE_MAXSIZE = 2048
+_approval_cache = {}
+
+# GitLab GET responses remembered by ETag so warm runs revalidate with
+# If-None-Match and get an empty 304 for unchanged resources.
+# Keyed by (url, params, token) -> (etag, json body, links).
+ETAG_CACHE_MAXSIZE = 1024
+_etag_cache = {}
+
+# JIRA ticket details are cached per client for this long; many MRs reference
+# the same ticket, and tickets that do not exist are remembered as well
+JIRA_CACHE_TTL_SECONDS = 300
+# The client lives as long as a warm container, so its cache is bounded too;
+# the oldest entry is evicted first
+JIRA_CACHE_MAXSIZE = 512
+
+# Shared HTTP session; kept at module scope so warm Lambda containers reuse
+# pooled keep-alive connections (and TLS sessions) across invocations.
+_session = None
+
+# Requests are retried with backoff on throttling and gateway errors, with
+# Retry-After honoured for 429/503. Besides idempotent methods this covers
+# POST, which GitLab and JIRA only get for read-only queries (GraphQL, JQL)
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                   allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"})
+
+# (connect, read) timeout for every request, so a stalled server fails that
+# request (and is retried) instead of hanging the run until the Lambda timeout
+HTTP_TIMEOUT = (3.05, 30)
+
+# Slack webhook posts are retried as well, so a rate-limited or briefly failing
+# webhook does not lose the day's reminder. Slack's Retry-After is honoured up to
+# 5s, otherwise the retries wait 0s and then 2s. A read timeout is not retried:
+# Slack may already have accepted the post, and a retry would repeat the message.
+# Webhooks answer within a second or two, so the read timeout is shorter than
+# HTTP_TIMEOUT: one post (a message part) takes at most 3 x 13s + 2 x 5s, about
+# 50s, so a message of up to five parts (250 blocks) fits in the 300s Lambda timeout
+SLACK_WEBHOOK_PREFIX = "https://hooks.slack.com/"
+SLACK_HTTP_RETRY = Retry(total=2, read=0, backoff_factor=1, backoff_max=4, status_forcelist=[429, 500, 502, 503, 504],
+                         allowed_methods=frozenset({"POST"}), respect_retry_after_header=True, retry_after_max=5)
+SLACK_HTTP_TIMEOUT = (3.05, 10)
+
+
+def _loads(resp: requests.Response):
+    """Decode a JSON response body, using orjson when it is installed
+
+    A body that is not JSON (e.g. an SSO or proxy HTML page) raises
+    requests' JSONDecodeError, as resp.json() does, so callers' RequestException
+    handling covers it.
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(resp.content)
+        return json.loads(resp.content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(
+            getattr(e, "msg", str(e)), getattr(e, "doc", ""), getattr(e, "pos", 0), response=resp
+        ) from e
+
+
+def _dumps(obj) -> bytes:
+    """Compact UTF-8 JSON request body (emoji are sent as-is rather than as \\u escapes)
+
+    orjson produces this form natively; the stdlib encoder is the fallback.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def get_session() -> requests.Session:
+    """Return the module-wide requests session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=HTTP_RETRY)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _session.mount(SLACK_WEBHOOK_PREFIX, HTTPAdapter(pool_maxsize=SLACK_MAX_WORKERS, max_retries=SLACK_HTTP_RETRY))
+    return _session
+
+
+class TransientMRError(Exception):
+    """Expected, retryable failure (e.g. a Slack webhook post that failed)"""
+
+
+# Parsed configs keyed by path -> (mtime, config), so warm runs skip the read
+# and YAML parse until the file changes
+_config_cache = {}
+
 
 def load_projects_config(config_path: str = "projects_config.yaml") -> dict:
-    """Load the multi-team, multi-project config from YAML."""
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+    """Load the multi-team, multi-project config from YAML.
+
+    The parsed dict is cached per file modification time and shared between
+    callers, so treat it as read-only.
+    """
+    mtime = os.path.getmtime(config_path)
+    cached = _config_cache.get(config_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=YAMLSafeLoader)
+    _config_cache[config_path] = (mtime, config)
+    return config
 
 
 def slack_mention(gitlab_username, mapping):
@@ -34,6 +185,17 @@ def slack_mention(gitlab_username, mapping):
     return gitlab_username
 
 
+def _plural(count: int, word: str) -> str:
+    """'1 day', '3 days'"""
+    return f"{count} {word}" if count == 1 else f"{count} {word}s"
+
+
+def _ceil_to_hour(moment: datetime) -> datetime:
+    """The start of the next hour, or moment itself when it is on the hour"""
+    hour = moment.replace(minute=0, second=0, microsecond=0)
+    return hour if hour == moment else hour + timedelta(hours=1)
+
+
 def get_author_username(author):
     if isinstance(author, dict):
         return author.get('username') or author.get('name') or str(author)
@@ -57,45 +219,262 @@ class TeamConfig:
 
 class TeamGitLabClient:
     """GitLab API client for a team (multiple projects, per-project tokens)."""
-    def __init__(self, team_config: TeamConfig, gitlab_url: str):
+
+    # Fields of a REST merge request the analyzer reads; the rest (~50 per MR,
+    # e.g. diff_refs, references, pipeline) is dropped right after parsing
+    MR_FIELDS = (
+        "iid", "title", "description", "web_url", "created_at", "updated_at",
+        "draft", "author", "assignees", "reviewers",
+    )
+
+    # Author GitLab REST reports for MRs whose author was deleted
+    GHOST_AUTHOR = {"name": "Ghost User", "username": "ghost"}
+
+    # Open, non-draft MRs for several projects in one round-trip, approvers
+    # included; fields mirror what the REST merge_requests and approvals
+    # endpoints return and the analyzer consumes
+    OPEN_MRS_QUERY = """
+    query($ids: [ID!], $createdBefore: Time) {
+      projects(ids: $ids) {
+        nodes {
+          id
+          mergeRequests(state: opened, draft: false, createdBefore: $createdBefore, first: 100) {
+            pageInfo { hasNextPage }
+            nodes {
+              iid title description webUrl createdAt updatedAt draft
+              author { name username }
+              assignees { nodes { name username } }
+              reviewers { nodes { name username } }
+              approvedBy { nodes { name username } }
+            }
+          }
+        }
+      }
+    }
+    """
+
+    def __init__(self, team_config: TeamConfig, gitlab_url: str, session: requests.Session = None):
         self.projects = team_config.gitlab_projects
         self.gitlab_url = gitlab_url
+        self.session = session or get_session()
 
-    def get_open_merge_requests(self) -> dict:
-        """Fetch open MRs for all projects in the team."""
-        all_mrs = {}
+    def get_open_merge_requests(self, created_before: datetime = None) -> dict:
+        """Fetch open MRs for all projects in the team.
+
+        Projects sharing a token are fetched with a single GraphQL request;
+        projects GraphQL cannot fully answer fall back to the REST endpoint,
+        all on a pool of up to FETCH_MAX_WORKERS concurrent requests.
+        When created_before is given, newer MRs are filtered out server-side.
+        The cutoff is rounded up to the hour: the result is a superset the
+        caller narrows by age anyway, and the request stays the same across
+        runs within that hour so REST pages can be revalidated by ETag.
+        """
+        if created_before:
+            created_before = _ceil_to_hour(created_before)
+        projects_by_token = {}
         for project_name, project in self.projects.items():
-            project_id = project["gitlab_project_id"]
-            token = project["gitlab_token"]
-            url = f"{self.gitlab_url}/api/v4/projects/{project_id}/merge_requests"
-            headers = {"Private-Token": token}
-            params = {"state": "opened", "per_page": 100}
-            try:
-                resp = requests.get(url, headers=headers, params=params)
-                resp.raise_for_status()
-                mrs = resp.json()
-                for mr in mrs:
-                    mr["project_name"] = project_name
-                    mr["project_id"] = project_id
-                    mr["project_token"] = token
-                all_mrs[project_name] = mrs
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch MRs for {project_name}: {e}")
-                all_mrs[project_name] = []
+            projects_by_token.setdefault(project["gitlab_token"], []).append(project_name)
+        all_mrs = {}
+        with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as pool:
+            def fetch_rest(project_name):
+                return pool.submit(self._get_open_merge_requests_rest, project_name,
+                                   self.projects[project_name], created_before)
+            # Projects GraphQL cannot address (non-numeric IDs) start on REST
+            # right away, overlapping with the GraphQL round-trips
+            rest_futures = {
+                project_name: fetch_rest(project_name) for project_name, project in self.projects.items()
+                if not str(project["gitlab_project_id"]).isdigit()
+            }
+            for project_mrs in pool.map(lambda item: self._get_open_merge_requests_graphql(*item, created_before),
+                                        projects_by_token.items()):
+                all_mrs.update(project_mrs)
+            for project_name in self.projects:
+                if project_name not in all_mrs and project_name not in rest_futures:
+                    rest_futures[project_name] = fetch_rest(project_name)
+            for project_name, future in rest_futures.items():
+                all_mrs[project_name] = future.result()
+        return {project_name: all_mrs[project_name] for project_name in self.projects}
+
+    def _get_open_merge_requests_rest(self, project_name: str, project: dict,
+                                      created_before: datetime = None) -> list:
+        project_id = project["gitlab_project_id"]
+        token = project["gitlab_token"]
+        url = f"{self.gitlab_url}/api/v4/projects/{project_id}/merge_requests"
+        headers = {"Private-Token": token}
+        params = {"state": "opened", "wip": "no", "per_page": 100}
+        if created_before:
+            params["created_before"] = created_before.isoformat()
+        try:
+            return [
+                {**mr, "project_name": project_name, "project_id": project_id, "project_token": token}
+                for mr in self._get_all_pages(url, headers, params, self._project_mr_fields)
+            ]
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch MRs for {project_name}: {e}")
+            return []
+
+    @classmethod
+    def _project_mr_fields(cls, mrs: list) -> list:
+        """Keep only MR_FIELDS of each REST merge request"""
+        return [{field: mr[field] for field in cls.MR_FIELDS if field in mr} for mr in mrs]
+
+    def _get_json(self, url: str, headers: dict, params: dict = None, transform=None):
+        """Conditional GET returning (json body, links), served from the ETag cache on 304
+
+        transform, when given, is applied to the parsed body before it is
+        cached and returned, so only what callers read is kept.
+        """
+        cache_key = (url, tuple(sorted((params or {}).items())), headers.get("Private-Token"))
+        cached = _etag_cache.get(cache_key)
+        if cached:
+            headers = {**headers, "If-None-Match": cached[0]}
+        with _gitlab_request_slots:
+            resp = self.session.get(url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
+        if cached and resp.status_code == 304:
+            return cached[1], cached[2]
+        resp.raise_for_status()
+        body = _loads(resp)
+        if transform is not None:
+            body = transform(body)
+        etag = resp.headers.get("ETag")
+        if etag:
+            if len(_etag_cache) >= ETAG_CACHE_MAXSIZE:
+                _etag_cache.clear()
+            _etag_cache[cache_key] = (etag, body, resp.links)
+        return body, resp.links
+
+    def _get_all_pages(self, url: str, headers: dict, params: dict, transform=None) -> list:
+        """GET every page of a paginated GitLab list endpoint.
+
+        The page count is read from the first response's ``last`` link and the
+        remaining pages are fetched concurrently; when GitLab omits that link
+        (e.g. very large result sets) the ``next`` links are followed instead.
+        """
+        first_page, links = self._get_json(url, headers, {**params, "page": 1}, transform)
+        items = list(first_page)
+        last_url = links.get("last", {}).get("url")
+        if last_url:
+            last_page = int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+            if last_page > 1:
+                def get_page(page):
+                    return self._get_json(url, headers, {**params, "page": page}, transform)[0]
+                with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as pool:
+                    for page_items in pool.map(get_page, range(2, last_page + 1)):
+                        items.extend(page_items)
+            return items
+        next_url = links.get("next", {}).get("url")
+        while next_url:
+            page_items, links = self._get_json(next_url, headers, transform=transform)
+            items.extend(page_items)
+            next_url = links.get("next", {}).get("url")
+        return items
+
+    def _get_open_merge_requests_graphql(self, token: str, project_names: list,
+                                         created_before: datetime = None) -> dict:
+        """Open MRs keyed by project name for the projects GraphQL fully covered.
+
+        Projects with non-numeric IDs, more than one page of open MRs, or that
+        are missing from the response (or returned without merge requests, as
+        when MRs are disabled or hidden from the token) are left out so the
+        caller uses REST.
+        """
+        gids = {}
+        for project_name in project_names:
+            project_id = str(self.projects[project_name]["gitlab_project_id"])
+            if project_id.isdigit():
+                gids[f"gid://gitlab/Project/{project_id}"] = project_name
+        if not gids:
+            return {}
+        url = f"{self.gitlab_url}/api/graphql"
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        variables = {"ids": list(gids)}
+        if created_before:
+            variables["createdBefore"] = created_before.isoformat()
+        payload = {"query": self.OPEN_MRS_QUERY, "variables": variables}
+        try:
+            with _gitlab_request_slots:
+                resp = self.session.post(url, headers=headers, data=_dumps(payload), timeout=HTTP_TIMEOUT)
+            resp.raise_for_status()
+            body = _loads(resp)
+            if body.get("errors"):
+                raise ValueError(body["errors"])
+            project_nodes = body["data"]["projects"]["nodes"]
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"GraphQL MR fetch failed, falling back to REST for {', '.join(gids.values())}: {e}")
+            return {}
+        all_mrs = {}
+        for node in project_nodes:
+            project_name = gids.get(node["id"])
+            connection = node["mergeRequests"]
+            if project_name is None or not connection or connection["pageInfo"]["hasNextPage"]:
+                continue
+            project_id = self.projects[project_name]["gitlab_project_id"]
+            all_mrs[project_name] = [
+                {
+                    "iid": int(mr["iid"]),
+                    "title": mr["title"],
+                    "description": mr["description"],
+                    "web_url": mr["webUrl"],
+                    "created_at": mr["createdAt"],
+                    "updated_at": mr["updatedAt"],
+                    "draft": mr["draft"],
+                    # Null for deleted users; REST reports those as the ghost user
+                    "author": mr["author"] or self.GHOST_AUTHOR,
+                    "assignees": mr["assignees"]["nodes"],
+                    "reviewers": mr["reviewers"]["nodes"],
+                    # Same shape as the REST /approvals response
+                    "approved_by": [{"user": user} for user in mr["approvedBy"]["nodes"]],
+                    "project_name": project_name,
+                    "project_id": project_id,
+                    "project_token": token,
+                }
+                for mr in connection["nodes"]
+            ]
         return all_mrs
 
     def get_merge_request_approvals(self, project_id: str, mr_iid: int, token: str) -> dict:
         url = f"{self.gitlab_url}/api/v4/projects/{project_id}/merge_requests/{mr_iid}/approvals"
         headers = {"Private-Token": token}
         try:
-            resp = requests.get(url, headers=headers)
-            resp.raise_for_status()
-            return resp.json()
+            return self._get_json(url, headers)[0]
         except requests.RequestException as e:
             logger.warning(f"Failed to fetch approval status for MR {mr_iid} in project {project_id}: {e}")
             return {}
 
 
+def _remember_approval(cache_key: tuple, approved: bool, now: float):
+    if len(_approval_cache) >= APPROVAL_CACHE_MAXSIZE:
+        expired = [k for k, (_, ts) in list(_approval_cache.items()) if now - ts > APPROVAL_CACHE_TTL_SECONDS]
+        for k in expired:
+            _approval_cache.pop(k, None)
+        if len(_approval_cache) >= APPROVAL_CACHE_MAXSIZE:
+            _approval_cache.clear()
+    _approval_cache[cache_key] = (approved, now)
+
+
+# MR author names/usernames containing any of these are treated as bots;
+# most common first, as alternatives are tried in order at each position
+BOT_INDICATORS = (
+    'bot', 'renovate', 'dependabot', 'dependency', 'automated',
+    'gitlab-ci', 'github-actions', 'snyk', 'auto-update', 'greenkeeper',
+    'whitesource', 'dependent_pat', 'dependencybot'
+)
+# Lowercased MR title fragments that mark dependency-update MRs, same ordering
+DEPENDENCY_PATTERNS = (
+    'bump ', 'chore(deps)', 'build(deps)', 'deps:', 'build(deps-dev)',
+    'update dependencies', 'dependency update', 'version bump',
+    'security update', '[security]', 'security patch', 'auto-update',
+    'automated update', 'upgrade dependencies', 'npm audit fix',
+    'yarn upgrade', 'pip upgrade', 'requirements update', 'package update'
+)
+# Each list folded into one alternation so a title/author is scanned once
+BOT_INDICATOR_RE = re.compile('|'.join(map(re.escape, BOT_INDICATORS)))
+DEPENDENCY_PATTERN_RE = re.compile('|'.join(map(re.escape, DEPENDENCY_PATTERNS)))
+# First JIRA key in the MR title/description; a bracketed key such as
+# [PROJ-123] matches on its inner PROJ-123
+JIRA_TICKET_RE = re.compile(r'([A-Z]+-\d+)')
+
+
 class TeamMRAnalyzer:
     """Analyze MRs for a team, using per-team thresholds."""
     def __init__(self, team_config: TeamConfig, gitlab_url: str, jira_client):
@@ -103,139 +482,306 @@ class TeamMRAnalyzer:
         self.gitlab = TeamGitLabClient(team_config, gitlab_url)
         self.jira = jira_client
         self.thresholds = team_config.threshold_config
+        # Threshold per configured JIRA priority (None: no or unconfigured priority),
+        # built once; JIRA priorities arrive lowercased, so lookups go straight here
+        base_threshold = self.thresholds["stale_days_threshold"]
+        self.priority_thresholds = {None: base_threshold}
+        if self.thresholds.get("use_priority_thresholds", True):
+            for key in self.thresholds:
+                if key.startswith("threshold_"):
+                    priority = key[len("threshold_"):]
+                    self.priority_thresholds[priority] = self.thresholds.get(f"threshold_{priority.lower()}", base_threshold)
+        # With a single effective threshold, JIRA priority cannot change which MRs are stale
+        self.uniform_threshold = len(set(self.priority_thresholds.values())) == 1
 
     def get_threshold_for_priority(self, priority: str) -> int:
-        if not self.thresholds.get("use_priority_thresholds", True) or not priority:
-            return self.thresholds["stale_days_threshold"]
-        return self.thresholds.get(f"threshold_{priority.lower()}", self.thresholds["stale_days_threshold"])
+        if not priority:
+            return self.priority_thresholds[None]
+        return self.priority_thresholds.get(priority.lower(), self.priority_thresholds[None])
 
-    def is_mr_stale(self, created_at: str, priority: str = None) -> bool:
-        created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        threshold_days = self.get_threshold_for_priority(priority)
-        threshold_date = datetime.now().replace(tzinfo=created_date.tzinfo) - timedelta(days=threshold_days)
-        return created_date < threshold_date
+    def get_min_threshold(self) -> int:
+        """Smallest threshold any JIRA priority can map to"""
+        return min(self.priority_thresholds.values())
 
-    def is_mr_approved(self, project_id: str, mr_iid: int, token: str) -> bool:
+    def is_mr_stale(self, created_date: datetime, now: datetime, priority: str = None,
+                    threshold_days: int = None) -> bool:
+        if threshold_days is None:
+            threshold_days = self.get_threshold_for_priority(priority)
+        return created_date < now - timedelta(days=threshold_days)
+
+    def is_mr_approved(self, mr: dict) -> bool:
+        # MRs fetched over GraphQL already carry their approvers
+        if 'approved_by' in mr:
+            return len(mr['approved_by']) > 0
+        project_id, mr_iid, token, updated_at = mr['project_id'], mr['iid'], mr.get('project_token'), mr.get('updated_at')
+        cache_key = (project_id, mr_iid, updated_at)
+        now = time.monotonic()
+        if updated_at:
+            cached = _approval_cache.get(cache_key)
+            if cached and now - cached[1] <= APPROVAL_CACHE_TTL_SECONDS:
+                return cached[0]
         approvals = self.gitlab.get_merge_request_approvals(project_id, mr_iid, token)
         if not approvals:
             return False
         approved_by = approvals.get('approved_by', [])
-        return len(approved_by) > 0
+        approved = len(approved_by) > 0
+        if updated_at:
+            _remember_approval(cache_key, approved, now)
+        return approved
 
     def is_bot_or_dependency_mr(self, mr: dict) -> bool:
         # Use same logic as before, or refactor as needed
-        title = mr['title'].lower()
-        author_name = mr['author']['name'].lower()
-        author_username = mr['author']['username'].lower()
-        bot_indicators = [
-            'dependabot', 'renovate', 'greenkeeper', 'snyk', 'whitesource',
-            'github-actions', 'gitlab-ci', 'automated', 'bot', 'dependency',
-            'dependent_pat', 'dependencybot', 'auto-update'
-        ]
-        for bot_indicator in bot_indicators:
-            if bot_indicator in author_name or bot_indicator in author_username:
-                return True
-        dependency_patterns = [
-            'build(deps)', 'build(deps-dev)', 'chore(deps)', 'deps:',
-            'bump ', 'update dependencies', 'upgrade dependencies',
-            'security update', 'npm audit fix', 'yarn upgrade',
-            'pip upgrade', 'requirements update', 'package update',
-            'version bump', 'dependency update', 'auto-update',
-            'automated update', '[security]', 'security patch'
-        ]
-        for pattern in dependency_patterns:
-            if pattern in title:
-                return True
-        return False
+        author = mr['author']
+        if BOT_INDICATOR_RE.search(f"{author['name']}\0{author['username']}".lower()):
+            return True
+        return DEPENDENCY_PATTERN_RE.search(mr['title'].lower()) is not None
 
     def extract_jira_ticket(self, mr_title: str, mr_description: str) -> str:
-        import re
-        patterns = [r'([A-Z]+-\d+)', r'\[([A-Z]+-\d+)\]']
-        text = f"{mr_title} {mr_description}"
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1)
+        # The title usually carries the key, so the (possibly long) description
+        # is only scanned when it does not
+        match = JIRA_TICKET_RE.search(mr_title) or JIRA_TICKET_RE.search(mr_description or '')
+        if match:
+            return match.group(1)
         return None
 
-    def get_stale_mrs(self) -> list:
-        all_open_mrs = self.gitlab.get_open_merge_requests()
-        stale_mrs = []
-        for project_name, mrs in all_open_mrs.items():
-            for mr in mrs:
-                jira_ticket = self.extract_jira_ticket(mr['title'], mr.get('description', ''))
-                jira_details = {'status': None, 'priority': None, 'priority_id': None}
-                if jira_ticket:
-                    jira_details = self.jira.get_ticket_details(jira_ticket)
-                if not self.is_mr_stale(mr['created_at'], jira_details['priority']):
-                    continue
-                if self.is_mr_approved(mr['project_id'], mr['iid'], mr.get('project_token')):
-                    continue
+    def get_jira_details(self, jira_tickets: List[Optional[str]]) -> List[dict]:
+        """JIRA details for each ticket, fetched in bulk (empty where there is no ticket)
+
+        Each distinct ticket is requested once, however many MRs reference it.
+        """
+        no_ticket = {'status': None, 'priority': None, 'priority_id': None}
+        keys = list(dict.fromkeys(ticket for ticket in jira_tickets if ticket))
+        details_by_key = self.jira.get_tickets_bulk(keys) if keys else {}
+        return [details_by_key.get(ticket, no_ticket) if ticket else no_ticket for ticket in jira_tickets]
+
+    def get_stale_mrs(self) -> List['StaleMR']:
+        # MRs too young to be stale under any priority threshold are filtered
+        # out by GitLab; the remaining in-memory checks (drafts, bot MRs, and the
+        # same age cut for servers that ignore the filter) run before any JIRA
+        # or approvals request
+        now = datetime.now(timezone.utc)
+        min_threshold_date = now - timedelta(days=self.get_min_threshold())
+        # Cutoff per JIRA priority, computed once per run rather than per MR
+        threshold_dates = {priority: now - timedelta(days=days) for priority, days in self.priority_thresholds.items()}
+        all_open_mrs = self.gitlab.get_open_merge_requests(created_before=min_threshold_date)
+        mrs = []
+        created_dates = []
+        for project_mrs in all_open_mrs.values():
+            for mr in project_mrs:
                 if mr.get('draft', False) or 'WIP:' in mr['title'] or 'Draft:' in mr['title']:
                     continue
                 if self.is_bot_or_dependency_mr(mr):
                     continue
-                created_date = datetime.fromisoformat(mr['created_at'].replace('Z', '+00:00'))
-                days_old = (datetime.now().replace(tzinfo=created_date.tzinfo) - created_date).days
-                applicable_threshold = self.get_threshold_for_priority(jira_details['priority'])
-                stale_mr = {
-                    'title': mr['title'],
-                    'web_url': mr['web_url'],
-                    'iid': mr['iid'],
-                    'author': mr['author']['name'],
-                    'assignees': [assignee['name'] for assignee in mr.get('assignees', [])],
-                    'reviewers': [reviewer['name'] for reviewer in mr.get('reviewers', [])],
-                    'days_old': days_old,
-                    'jira_ticket': jira_ticket,
-                    'jira_status': jira_details['status'],
-                    'jira_priority': jira_details['priority'],
-                    'threshold_used': applicable_threshold,
-                    'created_at': mr['created_at'],
-                    'project_name': project_name,
-                    'project_id': mr['project_id']
-                }
-                stale_mrs.append(stale_mr)
-        return stale_mrs
+                created_date = parse_iso_datetime(mr['created_at'])
+                if created_date >= min_threshold_date:
+                    continue
+                mrs.append(mr)
+                created_dates.append(created_date)
+        jira_tickets = [self.extract_jira_ticket(mr['title'], mr.get('description', '')) for mr in mrs]
+        if self.uniform_threshold:
+            # Every MR left is already stale whatever its priority, so JIRA is
+            # only needed to display the MRs that get reported: drop approved
+            # MRs first and look up just the remaining tickets
+            with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as pool:
+                approvals = list(pool.map(self.is_mr_approved, mrs))
+            unapproved = [
+                (mr, created_date, jira_ticket)
+                for mr, created_date, jira_ticket, approved in zip(mrs, created_dates, jira_tickets, approvals)
+                if not approved
+            ]
+            all_jira_details = self.get_jira_details([jira_ticket for _, _, jira_ticket in unapproved])
+            return [
+                self._build_stale_mr(mr, jira_ticket, jira_details, created_date, now)
+                for (mr, created_date, jira_ticket), jira_details in zip(unapproved, all_jira_details)
+            ]
+        # All tickets are resolved with one JIRA search while approval checks
+        # run concurrently: MRs past the largest threshold are stale whatever
+        # their priority and are checked right away, the rest once their
+        # priority is known, so a team's wall time is a few round-trips rather
+        # than one per MR
+        max_threshold_date = now - timedelta(days=max(self.priority_thresholds.values()))
+        with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as pool:
+            jira_future = pool.submit(self.get_jira_details, jira_tickets)
+            approval_futures = [
+                pool.submit(self.is_mr_approved, mr) if created_date < max_threshold_date else None
+                for mr, created_date in zip(mrs, created_dates)
+            ]
+            candidates = []
+            for mr, created_date, jira_ticket, jira_details, approval_future in zip(
+                    mrs, created_dates, jira_tickets, jira_future.result(), approval_futures):
+                if created_date >= threshold_dates.get(jira_details['priority'], threshold_dates[None]):
+                    continue
+                if approval_future is None:
+                    approval_future = pool.submit(self.is_mr_approved, mr)
+                candidates.append((mr, created_date, jira_ticket, jira_details, approval_future))
+            return [
+                self._build_stale_mr(mr, jira_ticket, jira_details, created_date, now)
+                for mr, created_date, jira_ticket, jira_details, approval_future in candidates
+                if not approval_future.result()
+            ]
+
+    def _build_stale_mr(self, mr: dict, jira_ticket: Optional[str], jira_details: dict,
+                        created_date: datetime, now: datetime) -> 'StaleMR':
+        """The stale-MR record consumed by SlackNotifier"""
+        return StaleMR(
+            title=mr['title'],
+            web_url=mr['web_url'],
+            iid=mr['iid'],
+            author=mr['author']['name'],
+            assignees=[assignee['name'] for assignee in mr.get('assignees', [])],
+            reviewers=[reviewer['name'] for reviewer in mr.get('reviewers', [])],
+            days_old=(now - created_date).days,
+            jira_ticket=jira_ticket,
+            jira_status=jira_details['status'],
+            jira_priority=jira_details['priority'],
+            jira_priority_display=jira_details['priority'].title() if jira_details['priority'] else None,
+            threshold_used=self.priority_thresholds.get(jira_details['priority'], self.priority_thresholds[None]),
+            created_at=mr['created_at'],
+            project_name=mr['project_name'],
+            project_id=mr['project_id'],
+        )
+
+
+@dataclass(slots=True)
+class StaleMR:
+    """A merge request that is past its review threshold, as reported to Slack"""
+    title: str
+    web_url: str
+    iid: int
+    author: str
+    assignees: List[str]
+    reviewers: List[str]
+    days_old: int
+    jira_ticket: Optional[str]
+    jira_status: Optional[str]
+    jira_priority: Optional[str]  # lowercase, as normalized by SimpleJiraClient
+    jira_priority_display: Optional[str]  # the same, cased for display
+    threshold_used: int
+    created_at: str
+    project_name: str
+    project_id: int
+
+
+# Rendered multi-project MR blocks shared by warm runs; see
+# SlackNotifier._get_project_mr_block
+MR_BLOCK_CACHE_MAXSIZE = 512
+_mr_block_cache = {}
 
 
 class SlackNotifier:
     """Slack notification handler"""
+
+    # Slack rejects messages with more than 50 blocks
+    MAX_BLOCKS_PER_MESSAGE = 50
+
+    # Blocks that never vary, shared by every message (read-only)
+    _HEADER_BLOCK = {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": "🔍 Stale Merge Requests Review"
+        }
+    }
+    _DIVIDER_BLOCK = {"type": "divider"}
+
+    # "Nothing stale" messages, built once; formatters hand out shallow copies
+    _EMPTY_MESSAGE = {
+        "text": "🎉 Great news! No stale merge requests found. All reviews are up to date!",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "🎉 *Great news!* No stale merge requests found. All reviews are up to date!"
+                }
+            }
+        ]
+    }
+    _EMPTY_MULTI_PROJECT_MESSAGE = {
+        "text": "🎉 Great news! No stale merge requests found across all projects. All reviews are up to date!",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "🎉 *Great news!* No stale merge requests found across all projects. All reviews are up to date!"
+                }
+            }
+        ]
+    }
+
+    # JIRA priority -> emoji (anything else gets the medium one)
+    PRIORITY_EMOJIS = {
+        'highest': '🔥',
+        'high': '⚡',
+        'medium': '📋',
+        'low': '📝',
+        'lowest': '💤'
+    }
+
+    HIGH_PRIORITIES = frozenset({'highest', 'high'})
+    # (high priority?, days over threshold clamped to 0..3) -> urgency emoji
+    URGENCY_EMOJIS = {
+        (True, 0): "🟠",  # Orange - high priority approaching threshold
+        (True, 1): "🔴",  # Red - high priority overdue
+        (True, 2): "🚨",  # Critical - high priority way overdue
+        (True, 3): "🚨",
+        (False, 0): "🟡",  # Yellow - approaching threshold
+        (False, 1): "🟠",  # Orange - overdue
+        (False, 2): "🟠",
+        (False, 3): "🔴",  # Red - way overdue
+    }
+
+    # Project-name substring -> emoji; first match wins
+    PROJECT_EMOJIS = {
+        'rohan': '🏰',
+        'edoras': '🏛️', 
+        'athena': '🦉',
+        'backend': '⚙️',
+        'frontend': '🎨',
+        'api': '🔌',
+        'web': '🌐',
+        'mobile': '📱',
+        'admin': '👑',
+        'core': '💎'
+    }
+    # Project name -> resolved emoji, shared by all notifiers (every team and
+    # warm run) since the result depends on the name alone
+    _project_emoji_cache = {}
     
-    def __init__(self, webhook_url: str, gitlab_to_slack: dict = None):
+    def __init__(self, webhook_url: str, gitlab_to_slack: dict = None, session: requests.Session = None,
+                 executor: ThreadPoolExecutor = None):
         self.webhook_url = webhook_url
         self.gitlab_to_slack = gitlab_to_slack or {}
+        self.session = session or get_session()
+        # Hashable view of the mention mapping, part of the MR block cache key
+        self._mention_key = frozenset(self.gitlab_to_slack.items())
+        # Posts queued by send_notification_async, awaited by flush()
+        self._executor = executor
+        self._pending = []
     
-    def format_mr_message(self, mrs: List[Dict]) -> Dict:
+    def format_mr_message(self, mrs: List[StaleMR]) -> Dict:
         """Format stale MRs into a beautiful Slack message (backward compatibility)"""
+        return self._format_flat_message(mrs, show_project=True, show_unresolved_jira=False)
+
+    def _format_flat_message(self, mrs: List[StaleMR], show_project: bool, show_unresolved_jira: bool) -> Dict:
+        """One section per MR, oldest first, for format_mr_message and format_single_project_message
+
+        show_project adds each MR's project line; show_unresolved_jira keeps the
+        JIRA line for tickets JIRA returned no details for.
+        """
         if not mrs:
-            return {
-                "text": "🎉 Great news! No stale merge requests found. All reviews are up to date!",
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "🎉 *Great news!* No stale merge requests found. All reviews are up to date!"
-                        }
-                    }
-                ]
-            }
+            return dict(self._EMPTY_MESSAGE)
         
-        # Sort MRs by days old (oldest first)
-        mrs.sort(key=lambda x: x['days_old'], reverse=True)
+        # Sort MRs by days old (oldest first), leaving the caller's list as is
+        mrs = sorted(mrs, key=attrgetter('days_old'), reverse=True)
         
         # Header message
         count = len(mrs)
-        header_text = f"🔔 *Daily Review Reminder* - {count} merge request{'s' if count != 1 else ''} need{'s' if count == 1 else ''} attention"
+        header_text = f"🔔 *Daily Review Reminder* - {_plural(count, 'merge request')} need{'s' if count == 1 else ''} attention"
         
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🔍 Stale Merge Requests Review"
-                }
-            },
+            self._HEADER_BLOCK,
             {
                 "type": "section",
                 "text": {
@@ -243,63 +789,51 @@ class SlackNotifier:
                     "text": header_text
                 }
             },
-            {
-                "type": "divider"
-            }
+            self._DIVIDER_BLOCK,
         ]
         
-        # Add each MR as a section
+        # Add each MR as a section, accumulating the footer's total age
+        total_age = 0
+        # MRs are separated by a rule inside their section rather than a
+        # divider block each, keeping long lists within Slack's block limit
+        separator = ""
         for mr in mrs:
-            # Create assignee/reviewer text
-            people_text = ""
-            if mr['reviewers']:
-                people_text += f"👀 *Reviewers:* {', '.join(slack_mention(get_username(r), self.gitlab_to_slack) for r in mr.get('reviewers', []))}\n"
-            if mr['assignees']:
-                people_text += f"👤 *Assignees:* {', '.join(slack_mention(get_username(a), self.gitlab_to_slack) for a in mr.get('assignees', []))}\n"
-            
-            people_text += f"✍️ *Author:* {slack_mention(get_username(mr['author']), self.gitlab_to_slack)}"
-            
-            # JIRA info with priority
-            jira_text = ""
-            # Only include JIRA info if ticket is found (status or priority is not None)
-            if mr.get('jira_ticket') and (mr.get('jira_status') or mr.get('jira_priority')):
-                jira_text = f"🎫 *JIRA:* {mr['jira_ticket']}"
-                if mr.get('jira_status'):
-                    jira_text += f" ({mr['jira_status']})"
-                if mr.get('jira_priority'):
-                    priority_emoji = self._get_priority_emoji(mr['jira_priority'])
-                    jira_text += f" {priority_emoji} {mr['jira_priority'].title()}"
-                jira_text += "\n"
-            # If no jira_ticket, jira_text remains empty and is not included
-
-            # Urgency indicator (enhanced with priority consideration)
-            urgency_emoji = self._get_urgency_emoji(mr['days_old'], mr['threshold_used'], mr.get('jira_priority'))
+            days_old = mr.days_old
+            threshold = mr.threshold_used
+            total_age += days_old
             
             # Add project info if available
             project_info = ""
-            if mr.get('project_name'):
-                project_emoji = self._get_project_emoji(mr['project_name'])
-                project_info = f"{project_emoji} *Project:* {mr['project_name']}\n"
+            if show_project and mr.project_name:
+                project_emoji = self._get_project_emoji(mr.project_name)
+                project_info = f"{project_emoji} *Project:* {mr.project_name}\n"
+            
+            title = mr.title
+            if len(title) > 60:
+                title = f"{title[:60]}..."
             
             mr_block = {
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": f"{urgency_emoji} *<{mr['web_url']}|{mr['title'][:60]}{'...' if len(mr['title']) > 60 else ''}>*\n"
-                            f"⏰ *Age:* {mr['days_old']} day{'s' if mr['days_old'] != 1 else ''} old "
-                            f"(threshold: {mr['threshold_used']} day{'s' if mr['threshold_used'] != 1 else ''})\n"
+                    "text": f"{separator}{self._get_urgency_emoji(days_old, threshold, mr.jira_priority)} *<{mr.web_url}|{title}>*\n"
+                            f"⏰ *Age:* {_plural(days_old, 'day')} old "
+                            f"(threshold: {_plural(threshold, 'day')})\n"
                             f"{project_info}"
-                            f"{jira_text if jira_text else ''}"
-                            f"{people_text}"
+                            f"{self._jira_text(mr, show_unresolved_jira)}"
+                            f"{self._people_text(mr)}"
                 }
             }
             blocks.append(mr_block)
-            blocks.append({"type": "divider"})
+            separator = "───────\n"
+        blocks.append(self._DIVIDER_BLOCK)
         
         # Footer with summary
-        footer_text = f"📊 *Summary:* {count} MR{'s' if count != 1 else ''} pending review • "
-        footer_text += f"Oldest: {max(mr['days_old'] for mr in mrs)} days • "
-        footer_text += f"Average age: {sum(mr['days_old'] for mr in mrs) // count} days"
+        footer_text = "".join([
+            f"📊 *Summary:* {_plural(count, 'MR')} pending review • ",
+            f"Oldest: {mrs[0].days_old} days • ",  # sorted oldest first
+            f"Average age: {total_age // count} days",
+        ])
         
         blocks.append({
             "type": "context",
@@ -316,40 +850,23 @@ class SlackNotifier:
             "blocks": blocks
         }
 
-    def format_multi_project_message(self, mrs_by_project: Dict[str, List[Dict]]) -> Dict:
+    def format_multi_project_message(self, mrs_by_project: Dict[str, List[StaleMR]]) -> Dict:
         """Format stale MRs from multiple projects into a beautiful Slack message"""
         if not mrs_by_project:
-            return {
-                "text": "🎉 Great news! No stale merge requests found across all projects. All reviews are up to date!",
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "🎉 *Great news!* No stale merge requests found across all projects. All reviews are up to date!"
-                        }
-                    }
-                ]
-            }
+            return dict(self._EMPTY_MULTI_PROJECT_MESSAGE)
         
         # Calculate totals
         total_mrs = sum(len(mrs) for mrs in mrs_by_project.values())
-        all_mrs = []
-        for mrs in mrs_by_project.values():
-            all_mrs.extend(mrs)
+        # Footer stats, accumulated while the project sections are built
+        oldest_mr = None
+        total_age = 0
         
         # Header message
         project_count = len(mrs_by_project)
-        header_text = f"🔔 *Daily Review Reminder* - {total_mrs} merge request{'s' if total_mrs != 1 else ''} need attention across {project_count} project{'s' if project_count != 1 else ''}"
+        header_text = f"🔔 *Daily Review Reminder* - {_plural(total_mrs, 'merge request')} need attention across {_plural(project_count, 'project')}"
         
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🔍 Stale Merge Requests Review"
-                }
-            },
+            self._HEADER_BLOCK,
             {
                 "type": "section",
                 "text": {
@@ -357,15 +874,17 @@ class SlackNotifier:
                     "text": header_text
                 }
             },
-            {
-                "type": "divider"
-            }
+            self._DIVIDER_BLOCK,
         ]
         
         # Add each project section
         for project_name, mrs in mrs_by_project.items():
-            # Sort MRs by days old (oldest first) within each project
-            mrs.sort(key=lambda x: x['days_old'], reverse=True)
+            # Sort MRs by days old (oldest first) within each project, leaving
+            # the caller's lists as they are
+            mrs = sorted(mrs, key=attrgetter('days_old'), reverse=True)
+            if mrs and (oldest_mr is None or mrs[0].days_old > oldest_mr.days_old):
+                oldest_mr = mrs[0]
+            total_age += sum(mr.days_old for mr in mrs)
             
             # Project header
             project_emoji = self._get_project_emoji(project_name)
@@ -373,61 +892,25 @@ class SlackNotifier:
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": f"{project_emoji} *{project_name}* - {len(mrs)} MR{'s' if len(mrs) != 1 else ''}"
+                    "text": f"{project_emoji} *{project_name}* - {_plural(len(mrs), 'MR')}"
                 }
             })
             
             # Add each MR in this project
-            for mr in mrs:
-                # Create assignee/reviewer text
-                people_text = ""
-                if mr['reviewers']:
-                    people_text += f"👀 *Reviewers:* {', '.join(slack_mention(get_username(r), self.gitlab_to_slack) for r in mr.get('reviewers', []))}\n"
-                if mr['assignees']:
-                    people_text += f"👤 *Assignees:* {', '.join(slack_mention(get_username(a), self.gitlab_to_slack) for a in mr.get('assignees', []))}\n"
-                
-                people_text += f"✍️ *Author:* {slack_mention(get_username(mr['author']), self.gitlab_to_slack)}"
-                
-                # JIRA info with priority
-                jira_text = ""
-                # Only include JIRA info if ticket is found (status or priority is not None)
-                if mr.get('jira_ticket') and (mr.get('jira_status') or mr.get('jira_priority')):
-                    jira_text = f"🎫 *JIRA:* {mr['jira_ticket']}"
-                    if mr.get('jira_status'):
-                        jira_text += f" ({mr['jira_status']})"
-                    if mr.get('jira_priority'):
-                        priority_emoji = self._get_priority_emoji(mr['jira_priority'])
-                        jira_text += f" {priority_emoji} {mr['jira_priority'].title()}"
-                    jira_text += "\n"
-                # If no jira_ticket, jira_text remains empty and is not included
-                
-                # Urgency indicator (enhanced with priority consideration)
-                urgency_emoji = self._get_urgency_emoji(mr['days_old'], mr['threshold_used'], mr.get('jira_priority'))
-                
-                mr_block = {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"    {urgency_emoji} *<{mr['web_url']}|{mr['title'][:55]}{'...' if len(mr['title']) > 55 else ''}>*\n"
-                                f"    ⏰ *Age:* {mr['days_old']} day{'s' if mr['days_old'] != 1 else ''} old "
-                                f"(threshold: {mr['threshold_used']} day{'s' if mr['threshold_used'] != 1 else ''})\n"
-                                f"    {jira_text.replace(chr(10), chr(10) + '    ') if jira_text else ''}"
-                                f"    {people_text.replace(chr(10), chr(10) + '    ')}"
-                }
-                }
-                blocks.append(mr_block)
+            blocks.extend(map(self._get_project_mr_block, mrs))
             
             # Add separator between projects
-            blocks.append({"type": "divider"})
+            blocks.append(self._DIVIDER_BLOCK)
         
         # Footer with summary
-        if all_mrs:
-            oldest_mr = max(all_mrs, key=lambda x: x['days_old'])
-            avg_age = sum(mr['days_old'] for mr in all_mrs) // len(all_mrs)
+        if total_mrs:
+            avg_age = total_age // total_mrs
             
-            footer_text = f"📊 *Summary:* {total_mrs} MR{'s' if total_mrs != 1 else ''} across {project_count} project{'s' if project_count != 1 else ''} • "
-            footer_text += f"Oldest: {oldest_mr['days_old']} days ({oldest_mr['project_name']}) • "
-            footer_text += f"Average age: {avg_age} days"
+            footer_text = "".join([
+                f"📊 *Summary:* {_plural(total_mrs, 'MR')} across {_plural(project_count, 'project')} • ",
+                f"Oldest: {oldest_mr.days_old} days ({oldest_mr.project_name}) • ",
+                f"Average age: {avg_age} days",
+            ])
             
             blocks.append({
                 "type": "context",
@@ -444,172 +927,143 @@ class SlackNotifier:
             "blocks": blocks
         }
     
+    def _get_project_mr_block(self, mr: StaleMR) -> Dict:
+        """MR section of the multi-project message, memoized by everything it renders
+
+        Most stale MRs are reported again on the next run with the same data, so
+        warm containers reuse their blocks instead of formatting them again.
+        """
+        cache_key = (
+            self._mention_key, mr.web_url, mr.title, mr.days_old, mr.threshold_used,
+            mr.jira_ticket, mr.jira_status, mr.jira_priority, get_username(mr.author),
+            tuple(get_username(r) for r in mr.reviewers), tuple(get_username(a) for a in mr.assignees),
+        )
+        mr_block = _mr_block_cache.get(cache_key)
+        if mr_block is None:
+            mr_block = self._format_project_mr_block(mr)
+            if len(_mr_block_cache) >= MR_BLOCK_CACHE_MAXSIZE:
+                _mr_block_cache.clear()
+            _mr_block_cache[cache_key] = mr_block
+        return mr_block
+
+    def _format_project_mr_block(self, mr: StaleMR) -> Dict:
+        # Urgency indicator (enhanced with priority consideration)
+        urgency_emoji = self._get_urgency_emoji(mr.days_old, mr.threshold_used, mr.jira_priority)
+        jira_text = self._jira_text(mr)
+        people_text = self._people_text(mr)
+        
+        title = mr.title
+        if len(title) > 55:
+            title = f"{title[:55]}..."
+        
+        mr_block = {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"    {urgency_emoji} *<{mr.web_url}|{title}>*\n"
+                        f"    ⏰ *Age:* {_plural(mr.days_old, 'day')} old "
+                        f"(threshold: {_plural(mr.threshold_used, 'day')})\n"
+                        f"    {jira_text.replace(chr(10), chr(10) + '    ') if jira_text else ''}"
+                        f"    {people_text.replace(chr(10), chr(10) + '    ')}"
+        }
+        }
+        return mr_block
+
+    def _people_text(self, mr: StaleMR) -> str:
+        """Reviewer, assignee and author lines, mentioning mapped Slack users"""
+        people_parts = []
+        if mr.reviewers:
+            people_parts.append(f"👀 *Reviewers:* {', '.join(slack_mention(get_username(r), self.gitlab_to_slack) for r in mr.reviewers)}")
+        if mr.assignees:
+            people_parts.append(f"👤 *Assignees:* {', '.join(slack_mention(get_username(a), self.gitlab_to_slack) for a in mr.assignees)}")
+        
+        people_parts.append(f"✍️ *Author:* {slack_mention(get_username(mr.author), self.gitlab_to_slack)}")
+        return "\n".join(people_parts)
+
+    def _jira_text(self, mr: StaleMR, show_unresolved: bool = False) -> str:
+        """JIRA line with status and priority, or "" when the MR has no ticket
+
+        A ticket JIRA returned no status or priority for is left out unless
+        show_unresolved is set.
+        """
+        if not mr.jira_ticket or not (show_unresolved or mr.jira_status or mr.jira_priority):
+            return ""
+        jira_parts = [f"🎫 *JIRA:* {mr.jira_ticket}"]
+        if mr.jira_status:
+            jira_parts.append(f" ({mr.jira_status})")
+        if mr.jira_priority:
+            priority_emoji = self._get_priority_emoji(mr.jira_priority)
+            jira_parts.append(f" {priority_emoji} {mr.jira_priority_display}")
+        jira_parts.append("\n")
+        return "".join(jira_parts)
+
     def _get_project_emoji(self, project_name: str) -> str:
         """Get emoji for project name"""
-        project_emojis = {
-            'rohan': '🏰',
-            'edoras': '🏛️', 
-            'athena': '🦉',
-            'backend': '⚙️',
-            'frontend': '🎨',
-            'api': '🔌',
-            'web': '🌐',
-            'mobile': '📱',
-            'admin': '👑',
-            'core': '💎'
-        }
+        emoji = self._project_emoji_cache.get(project_name)
+        if emoji is not None:
+            return emoji
         
         # Try to match project name (case insensitive)
-        for key, emoji in project_emojis.items():
-            if key in project_name.lower():
-                return emoji
+        lower_name = project_name.lower()
+        emoji = '📁'  # Default project emoji
+        for key, project_emoji in self.PROJECT_EMOJIS.items():
+            if key in lower_name:
+                emoji = project_emoji
+                break
         
-        return '📁'  # Default project emoji
+        self._project_emoji_cache[project_name] = emoji
+        return emoji
     
-    def format_single_project_message(self, mrs: List[Dict]) -> Dict:
+    def format_single_project_message(self, mrs: List[StaleMR]) -> Dict:
         """Format stale MRs into a beautiful Slack message"""
-        if not mrs:
-            return {
-                "text": "🎉 Great news! No stale merge requests found. All reviews are up to date!",
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "🎉 *Great news!* No stale merge requests found. All reviews are up to date!"
-                        }
-                    }
-                ]
-            }
-        
-        # Sort MRs by days old (oldest first)
-        mrs.sort(key=lambda x: x['days_old'], reverse=True)
-        
-        # Header message
-        count = len(mrs)
-        header_text = f"🔔 *Daily Review Reminder* - {count} merge request{'s' if count != 1 else ''} need{'s' if count == 1 else ''} attention"
-        
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🔍 Stale Merge Requests Review"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": header_text
-                }
-            },
-            {
-                "type": "divider"
-            }
-        ]
-        
-        # Add each MR as a section
-        for mr in mrs:
-            # Create assignee/reviewer text
-            people_text = ""
-            if mr['reviewers']:
-                people_text += f"👀 *Reviewers:* {', '.join(slack_mention(get_username(r), self.gitlab_to_slack) for r in mr.get('reviewers', []))}\n"
-            if mr['assignees']:
-                people_text += f"👤 *Assignees:* {', '.join(slack_mention(get_username(a), self.gitlab_to_slack) for a in mr.get('assignees', []))}\n"
-            
-            people_text += f"✍️ *Author:* {slack_mention(get_username(mr['author']), self.gitlab_to_slack)}"
-            
-            # JIRA info with priority
-            jira_text = ""
-            if mr['jira_ticket']:
-                jira_text = f"🎫 *JIRA:* {mr['jira_ticket']}"
-                if mr['jira_status']:
-                    jira_text += f" ({mr['jira_status']})"
-                if mr['jira_priority']:
-                    priority_emoji = self._get_priority_emoji(mr['jira_priority'])
-                    jira_text += f" {priority_emoji} {mr['jira_priority'].title()}"
-                jira_text += "\n"
-            
-            # Urgency indicator (enhanced with priority consideration)
-            urgency_emoji = self._get_urgency_emoji(mr['days_old'], mr['threshold_used'], mr.get('jira_priority'))
-            
-            mr_block = {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"{urgency_emoji} *<{mr['web_url']}|{mr['title'][:60]}{'...' if len(mr['title']) > 60 else ''}>*\n"
-                            f"⏰ *Age:* {mr['days_old']} day{'s' if mr['days_old'] != 1 else ''} old "
-                            f"(threshold: {mr['threshold_used']} day{'s' if mr['threshold_used'] != 1 else ''})\n"
-                            f"{jira_text}"
-                            f"{people_text}"
-                }
-            }
-            blocks.append(mr_block)
-            blocks.append({"type": "divider"})
-        
-        # Footer with summary
-        footer_text = f"📊 *Summary:* {count} MR{'s' if count != 1 else ''} pending review • "
-        footer_text += f"Oldest: {max(mr['days_old'] for mr in mrs)} days • "
-        footer_text += f"Average age: {sum(mr['days_old'] for mr in mrs) // count} days"
-        
-        blocks.append({
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": footer_text
-                }
-            ]
-        })
-        
-        return {
-            "text": header_text,  # Fallback text for notifications
-            "blocks": blocks
-        }
+        return self._format_flat_message(mrs, show_project=False, show_unresolved_jira=True)
     
     def _get_priority_emoji(self, priority: str) -> str:
-        """Get emoji for JIRA priority"""
-        priority_emojis = {
-            'highest': '🔥',
-            'high': '⚡',
-            'medium': '📋',
-            'low': '📝',
-            'lowest': '💤'
-        }
-        return priority_emojis.get(priority.lower(), '📋')
+        """Get emoji for a (lowercase) JIRA priority"""
+        return self.PRIORITY_EMOJIS.get(priority, '📋')
     
     def _get_urgency_emoji(self, days_old: int, threshold: int, priority: Optional[str]) -> str:
         """Get urgency emoji based on age, threshold, and priority"""
-        # Calculate how much over threshold the MR is
-        days_over_threshold = days_old - threshold
-        
-        # Priority-based urgency
-        if priority in ['highest', 'high']:
-            if days_over_threshold >= 2:
-                return "🚨"  # Critical - high priority way overdue
-            elif days_over_threshold >= 1:
-                return "🔴"  # Red - high priority overdue
-            else:
-                return "🟠"  # Orange - high priority approaching threshold
-        else:
-            # Standard urgency for medium/low/no priority
-            if days_over_threshold >= 3:
-                return "🔴"  # Red - way overdue
-            elif days_over_threshold >= 1:
-                return "🟠"  # Orange - overdue
-            else:
-                return "🟡"  # Yellow - approaching threshold
+        # How much over threshold the MR is; beyond 3 days the emoji no longer changes
+        days_over_threshold = min(max(days_old - threshold, 0), 3)
+        return self.URGENCY_EMOJIS[(priority in self.HIGH_PRIORITIES, days_over_threshold)]
     
+    def send_notification_async(self, message: Dict) -> Future:
+        """Queue the notification on the executor and return its Future (sent inline without one)"""
+        if self._executor is None:
+            future = Future()
+            future.set_result(self.send_notification(message))
+            return future
+        future = self._executor.submit(self.send_notification, message)
+        self._pending.append(future)
+        return future
+
+    def flush(self) -> bool:
+        """Wait for queued notifications; True if all of them were delivered"""
+        pending, self._pending = self._pending, []
+        return all([future.result() for future in pending])
+
+    def split_message(self, message: Dict) -> List[Dict]:
+        """Split a message into consecutive messages within Slack's block limit"""
+        blocks = message.get("blocks", [])
+        if len(blocks) <= self.MAX_BLOCKS_PER_MESSAGE:
+            return [message]
+        return [
+            {**message, "blocks": blocks[start:start + self.MAX_BLOCKS_PER_MESSAGE]}
+            for start in range(0, len(blocks), self.MAX_BLOCKS_PER_MESSAGE)
+        ]
+
     def send_notification(self, message: Dict) -> bool:
-        """Send notification to Slack"""
+        """Send notification to Slack, in several posts if it exceeds the block limit"""
         try:
-            response = requests.post(
-                self.webhook_url,
-                json=message,
-                headers={'Content-Type': 'application/json'}
-            )
-            response.raise_for_status()
+            for part in self.split_message(message):
+                response = self.session.post(
+                    self.webhook_url,
+                    data=_dumps(part),
+                    headers={'Content-Type': 'application/json; charset=utf-8'},
+                    timeout=SLACK_HTTP_TIMEOUT,
+                )
+                response.raise_for_status()
             logger.info("Slack notification sent successfully")
             return True
         except requests.RequestException as e:
@@ -618,63 +1072,209 @@ class SlackNotifier:
 
 
 class SimpleJiraClient:
-    def __init__(self, url, username, token):
+    # Keys per JQL search request, within JIRA's default maxResults cap
+    BULK_SEARCH_SIZE = 100
+
+    def __init__(self, url, username, token, session: requests.Session = None):
         self.base_url = url
         self.auth = (username, token)
+        self.session = session or get_session()
+        # ticket_key -> (details, monotonic timestamp, ETag of the issue response)
+        self._ticket_cache = {}
+        # One client serves the team pool and the per-ticket fallback pool,
+        # so updates to the bounded cache (evict oldest, then insert) are serialized
+        self._ticket_cache_lock = threading.Lock()
+
+    def clear_cache(self):
+        """Forget all cached ticket details, e.g. after tickets were edited"""
+        with self._ticket_cache_lock:
+            self._ticket_cache.clear()
+
+    def _remember_ticket(self, ticket_key: str, details: dict, now: float, etag: str = None):
+        with self._ticket_cache_lock:
+            self._ticket_cache.pop(ticket_key, None)
+            if len(self._ticket_cache) >= JIRA_CACHE_MAXSIZE:
+                self._ticket_cache.pop(next(iter(self._ticket_cache)))
+            self._ticket_cache[ticket_key] = (details, now, etag)
+
     def get_ticket_details(self, ticket_key: str) -> dict:
+        now = time.monotonic()
+        cached = self._ticket_cache.get(ticket_key)
+        if cached and now - cached[1] <= JIRA_CACHE_TTL_SECONDS:
+            return cached[0]
         url = f"{self.base_url}/rest/api/2/issue/{ticket_key}"
+        # Only the fields we read; an expired entry is revalidated by ETag
+        headers = {"If-None-Match": cached[2]} if cached and cached[2] else None
+        etag = None
         try:
-            response = requests.get(url, auth=self.auth)
+            with _jira_request_slots:
+                response = self.session.get(url, auth=self.auth, params={"fields": "status,priority"},
+                                            headers=headers, timeout=HTTP_TIMEOUT)
+            if headers and response.status_code == 304:
+                self._remember_ticket(ticket_key, cached[0], now, cached[2])
+                return cached[0]
             response.raise_for_status()
-            ticket_data = response.json()
-            return {
-                'status': ticket_data['fields']['status']['name'],
-                'priority': ticket_data['fields']['priority']['name'].lower() if ticket_data['fields']['priority'] else None,
-                'priority_id': ticket_data['fields']['priority']['id'] if ticket_data['fields']['priority'] else None
-            }
+            details = self._ticket_details(_loads(response)['fields'])
+            etag = response.headers.get("ETag")
+        except requests.HTTPError as e:
+            logger.warning(f"Failed to fetch JIRA ticket {ticket_key}: {e}")
+            details = {'status': None, 'priority': None, 'priority_id': None}
+            status = e.response.status_code if e.response is not None else None
+            # Missing or inaccessible ticket (4xx): remember it so it is not
+            # re-fetched; a rate limit or server error is retried next time
+            if status is None or not 400 <= status < 500 or status == 429:
+                return details
         except requests.RequestException as e:
             logger.warning(f"Failed to fetch JIRA ticket {ticket_key}: {e}")
             return {'status': None, 'priority': None, 'priority_id': None}
+        self._remember_ticket(ticket_key, details, now, etag)
+        return details
 
+    def get_tickets_bulk(self, ticket_keys: List[str]) -> Dict[str, dict]:
+        """Details for several tickets, with one JQL search per batch of uncached keys.
 
-def main():
-    """Main execution function"""
+        Tickets the search does not return (missing or not visible) get empty
+        details; if a search fails, its tickets are looked up individually,
+        concurrently.
+        """
+        now = time.monotonic()
+        details_by_key = {}
+        uncached = []
+        for ticket_key in dict.fromkeys(ticket_keys):
+            cached = self._ticket_cache.get(ticket_key)
+            if cached and now - cached[1] <= JIRA_CACHE_TTL_SECONDS:
+                details_by_key[ticket_key] = cached[0]
+            else:
+                uncached.append(ticket_key)
+        for start in range(0, len(uncached), self.BULK_SEARCH_SIZE):
+            batch = uncached[start:start + self.BULK_SEARCH_SIZE]
+            try:
+                found = self._search_tickets(batch)
+            except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"JIRA bulk search failed, fetching tickets individually: {e}")
+                with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as pool:
+                    details_by_key.update(zip(batch, pool.map(self.get_ticket_details, batch)))
+                continue
+            for ticket_key in batch:
+                details = found.get(ticket_key, {'status': None, 'priority': None, 'priority_id': None})
+                self._remember_ticket(ticket_key, details, now)
+                details_by_key[ticket_key] = details
+        return details_by_key
+
+    def _search_tickets(self, ticket_keys: List[str]) -> Dict[str, dict]:
+        url = f"{self.base_url}/rest/api/2/search"
+        payload = {
+            "jql": f"key in ({', '.join(ticket_keys)})",
+            "fields": ["status", "priority"],
+            "maxResults": len(ticket_keys),
+            # Unknown keys are reported as warnings instead of failing the search
+            "validateQuery": False,
+        }
+        with _jira_request_slots:
+            response = self.session.post(url, auth=self.auth, data=_dumps(payload),
+                                         headers={"Content-Type": "application/json"}, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return {issue['key']: self._ticket_details(issue['fields']) for issue in _loads(response)['issues']}
+
+    @staticmethod
+    def _ticket_details(fields: dict) -> dict:
+        return {
+            'status': fields['status']['name'],
+            'priority': fields['priority']['name'].lower() if fields['priority'] else None,
+            'priority_id': fields['priority']['id'] if fields['priority'] else None
+        }
+
+
+def get_team_names(teams_data: dict) -> list:
+    """Team names in the loaded config (everything except the user mapping)"""
+    return [k for k in teams_data if k != 'gitlab_to_slack']
+
+
+def build_jira_client() -> SimpleJiraClient:
+    """Build the JIRA client from the global JIRA environment variables"""
+    jira_url = os.getenv('JIRA_URL')
+    jira_username = os.getenv('JIRA_USERNAME')
+    jira_token = os.getenv('JIRA_TOKEN')
+    if not (jira_url and jira_username and jira_token):
+        raise ValueError("Missing required JIRA environment variables")
+    return SimpleJiraClient(jira_url, jira_username, jira_token)
+
+
+def _log_notification_result(team_name: str, success: bool, failed_teams: list):
+    if success:
+        logger.info(f"Slack notification sent for team {team_name}")
+    else:
+        logger.error(f"Failed to send Slack notification for team {team_name}")
+        failed_teams.append(team_name)
+
+
+def _analyze_team(team_name: str, team_data: dict, jira_client: SimpleJiraClient):
+    """Collect one team's stale MRs; returns (team_config, stale_mrs)"""
+    logger.info(f"Processing team: {team_name}")
+    team_config = TeamConfig(team_name, team_data)
+    analyzer = TeamMRAnalyzer(team_config, os.getenv('GITLAB_URL', 'https://gitlab.com'), jira_client)
+    return team_config, analyzer.get_stale_mrs()
+
+
+def main(jira_client: SimpleJiraClient = None, teams_data: dict = None, parallel_slack: bool = False,
+         team_names: list = None):
+    """Main execution function
+
+    Pre-built clients/config can be passed in by long-lived callers (e.g. the
+    Lambda handler) so they are not rebuilt on every run. With parallel_slack,
+    each team's Slack post is queued on a shared thread pool as soon as its
+    message is ready (SlackNotifier.send_notification_async), overlapping
+    webhook round-trips with the analysis of the next team; the notifiers are
+    flushed once every team has been analyzed.
+    Teams are analyzed concurrently (up to TEAM_MAX_WORKERS), and their
+    messages are built and sent in configuration order as results arrive.
+    team_names restricts the run to a subset of the configured teams.
+
+    Raises TransientMRError after all teams are processed if any team's Slack
+    notification could not be delivered.
+    """
+    slack_pool = ThreadPoolExecutor(max_workers=SLACK_MAX_WORKERS) if parallel_slack else None
+    pending_notifiers = {}
+    failed_teams = []
     try:
         # Load global JIRA config from env
-        jira_url = os.getenv('JIRA_URL')
-        jira_username = os.getenv('JIRA_USERNAME')
-        jira_token = os.getenv('JIRA_TOKEN')
-        if not (jira_url and jira_username and jira_token):
-            raise ValueError("Missing required JIRA environment variables")
-        jira_client = SimpleJiraClient(jira_url, jira_username, jira_token)
+        if jira_client is None:
+            jira_client = build_jira_client()
         # Load team/project config
-        teams_data = load_projects_config()
+        if teams_data is None:
+            teams_data = load_projects_config()
         gitlab_to_slack = teams_data.get('gitlab_to_slack', {})
         # Remove mapping from teams_data so it doesn't interfere with team configs
-        teams_data = {k: v for k, v in teams_data.items() if k != 'gitlab_to_slack'}
-        for team_name, team_data in teams_data.items():
-            logger.info(f"Processing team: {team_name}")
-            team_config = TeamConfig(team_name, team_data)
-            analyzer = TeamMRAnalyzer(team_config, os.getenv('GITLAB_URL', 'https://gitlab.com'), jira_client)
-            stale_mrs = analyzer.get_stale_mrs()
-            if not stale_mrs:
-                logger.info(f"No stale MRs for team {team_name}")
-                continue
-            # Group stale MRs by project name for Slack message
-            mrs_by_project = {}
-            for mr in stale_mrs:
-                pname = mr['project_name']
-                mrs_by_project.setdefault(pname, []).append(mr)
-            notifier = SlackNotifier(team_config.slack_webhook_url, gitlab_to_slack)
-            message = notifier.format_multi_project_message(mrs_by_project)
-            success = notifier.send_notification(message)
-            if success:
-                logger.info(f"Slack notification sent for team {team_name}")
-            else:
-                logger.error(f"Failed to send Slack notification for team {team_name}")
+        teams_data = {k: teams_data[k] for k in get_team_names(teams_data) if team_names is None or k in team_names}
+        with ThreadPoolExecutor(max_workers=max(1, min(TEAM_MAX_WORKERS, len(teams_data)))) as team_pool:
+            analyses = team_pool.map(_analyze_team, teams_data, teams_data.values(),
+                                     [jira_client] * len(teams_data))
+            for team_name, (team_config, stale_mrs) in zip(teams_data, analyses):
+                if not stale_mrs:
+                    logger.info(f"No stale MRs for team {team_name}")
+                    continue
+                # Group stale MRs by project name for Slack message
+                mrs_by_project = {}
+                for mr in stale_mrs:
+                    pname = mr.project_name
+                    mrs_by_project.setdefault(pname, []).append(mr)
+                notifier = SlackNotifier(team_config.slack_webhook_url, gitlab_to_slack, executor=slack_pool)
+                message = notifier.format_multi_project_message(mrs_by_project)
+                if slack_pool:
+                    notifier.send_notification_async(message)
+                    pending_notifiers[team_name] = notifier
+                else:
+                    _log_notification_result(team_name, notifier.send_notification(message), failed_teams)
+        for team_name, notifier in pending_notifiers.items():
+            _log_notification_result(team_name, notifier.flush(), failed_teams)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise
+    finally:
+        if slack_pool:
+            slack_pool.shutdown(wait=True)
+    if failed_teams:
+        raise TransientMRError(f"Failed to send Slack notification for team(s): {', '.join(failed_teams)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+import pytest
+from unittest.mock import MagicMock
+import lambda_function
+import json
+
+
+# --- Fakes ---
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+class FakeDynamoDB:
+    """In-memory stand-in for the idempotency table, applying the claim condition"""
+
+    class exceptions:
+        ConditionalCheckFailedException = ConditionalCheckFailedException
+
+    def __init__(self):
+        self.items = {}
+        self.put_item = MagicMock(side_effect=self._put_item)
+        self.update_item = MagicMock(side_effect=self._update_item)
+        self.delete_item = MagicMock(side_effect=self._delete_item)
+
+    def _put_item(self, TableName, Item, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+        existing = self.items.get(Item["id"]["S"])
+        now = int(ExpressionAttributeValues[":now"]["N"])
+        now_ms = int(ExpressionAttributeValues[":now_ms"]["N"])
+        if existing and not (
+            int(existing["expiration"]["N"]) < now
+            or (existing["status"]["S"] == "IN_PROGRESS" and int(existing["in_progress_expiry"]["N"]) < now_ms)
+        ):
+            raise ConditionalCheckFailedException()
+        self.items[Item["id"]["S"]] = dict(Item)
+
+    def _update_item(self, TableName, Key, UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+        item = self.items[Key["id"]["S"]]
+        item["status"] = ExpressionAttributeValues[":completed"]
+        item.pop("in_progress_expiry", None)
+
+    def _delete_item(self, TableName, Key):
+        self.items.pop(Key["id"]["S"], None)
+
+
+def fake_context(remaining_ms=300_000):
+    context = MagicMock(aws_request_id="req-1", invoked_function_arn="arn:aws:lambda:eu-west-1:123:function:mr")
+    context.get_remaining_time_in_millis.return_value = remaining_ms
+    return context
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def handler_env(monkeypatch):
+    # Handler with a stubbed core run, fresh container state and a fake idempotency table
+    monkeypatch.setenv("IDEMPOTENCY_TABLE", "idempotency")
+    monkeypatch.setattr(lambda_function, "_claimed_events", {})
+    monkeypatch.setattr(lambda_function, "_CLIENTS", {"jira": None, "config": {}})
+    dynamodb = FakeDynamoDB()
+    monkeypatch.setattr(lambda_function, "_get_dynamodb_client", lambda: dynamodb)
+    run = MagicMock()
+    monkeypatch.setattr(lambda_function, "_run_mr_reminder", run)
+    return dynamodb, run
+
+
+# --- Tests ---
+
+def test_duplicate_event_skipped(handler_env):
+    """
+    Test that an event id already completed by another container is skipped without running again.
+    """
+    dynamodb, run = handler_env
+    assert lambda_function.lambda_handler({"id": "evt-1"}, fake_context())["statusCode"] == 200
+    assert dynamodb.items["evt-1"]["status"] == {"S": "COMPLETED"}
+    lambda_function._claimed_events.clear()
+    response = lambda_function.lambda_handler({"id": "evt-1"}, fake_context())
+    assert json.loads(response["body"])["message"] == "Duplicate event skipped"
+    assert run.call_count == 1
+
+
+def test_failed_run_releases_claim(handler_env):
+    """
+    Test that a failed run deletes its claim, so the retry of the event is processed.
+    """
+    dynamodb, run = handler_env
+    run.side_effect = RuntimeError("boom")
+    assert lambda_function.lambda_handler({"id": "evt-1"}, fake_context())["statusCode"] == 500
+    dynamodb.delete_item.assert_called_once()
+    run.side_effect = None
+    assert lambda_function.lambda_handler({"id": "evt-1"}, fake_context())["statusCode"] == 200
+    assert run.call_count == 2
+
+
+def test_failed_claim_does_not_release_record(handler_env):
+    """
+    Test that when writing the claim itself fails, the record (possibly another container's claim) is left alone.
+    """
+    dynamodb, run = handler_env
+    dynamodb.put_item.side_effect = RuntimeError("throttled")
+    assert lambda_function.lambda_handler({"id": "evt-1"}, fake_context())["statusCode"] == 500
+    dynamodb.delete_item.assert_not_called()
+    run.assert_not_called()
+
+
+def test_expired_in_progress_claim_retried(handler_env, monkeypatch):
+    """
+    Test that a claim left IN_PROGRESS by a run that timed out blocks retries until that run's deadline,
+    and is taken over afterwards.
+    """
+    dynamodb, run = handler_env
+    clock = [1_700_000_000.0]
+    monkeypatch.setattr(lambda_function.time, "time", lambda: clock[0])
+    assert lambda_function._claim_event("evt-1", fake_context(remaining_ms=300_000))
+    # The run times out without completing or releasing; the retry lands on a new container
+    lambda_function._claimed_events.clear()
+    clock[0] += 60
+    assert lambda_function.lambda_handler({"id": "evt-1"}, fake_context())["statusCode"] == 200
+    run.assert_not_called()
+    clock[0] += 300
+    assert lambda_function.lambda_handler({"id": "evt-1"}, fake_context())["statusCode"] == 200
+    run.assert_called_once()
+    assert dynamodb.items["evt-1"]["status"] == {"S": "COMPLETED"}
+
+
+def test_dispatch_enqueues_one_job_per_team(handler_env, monkeypatch):
+    """
+    Test that a dispatch event sends one SQS job per team, each with an id derived from the event id.
+    """
+    monkeypatch.setenv("MR_REMINDER_QUEUE_URL", "https://sqs.example.com/jobs")
+    monkeypatch.setattr(lambda_function, "_CLIENTS", {"jira": None, "config": {"TEAM_A": {}, "TEAM_B": {}, "gitlab_to_slack": {}}})
+    sqs = MagicMock()
+    monkeypatch.setattr(lambda_function, "_get_sqs_client", lambda: sqs)
+    response = lambda_function.lambda_handler({"mode": "dispatch", "id": "evt-9"}, fake_context())
+    assert response["statusCode"] == 202
+    jobs = [json.loads(call[1]["MessageBody"]) for call in sqs.send_message.call_args_list]
+    assert jobs == [
+        {"mode": "process", "teams": ["TEAM_A"], "id": "evt-9:TEAM_A"},
+        {"mode": "process", "teams": ["TEAM_B"], "id": "evt-9:TEAM_B"},
+    ]
+    assert {call[1]["QueueUrl"] for call in sqs.send_message.call_args_list} == {"https://sqs.example.com/jobs"}
+
+
+def test_sqs_batch_reports_failed_jobs_and_drops_malformed(handler_env):
+    """
+    Test that a job whose run fails transiently (503) is reported in batchItemFailures, while malformed
+    bodies, including JSON that is not an object, are dropped without failing the batch.
+    """
+    _, run = handler_env
+    core = lambda_function._load_core()
+    def run_team(team_names, **kwargs):
+        if team_names == ["TEAM_B"]:
+            raise core.TransientMRError("Slack down")
+    run.side_effect = run_team
+    def record(message_id, body):
+        return {"messageId": message_id, "body": body}
+    event = {"Records": [
+        record("m1", json.dumps({"mode": "process", "teams": ["TEAM_A"], "id": "evt-9:TEAM_A"})),
+        record("m2", json.dumps({"mode": "process", "teams": ["TEAM_B"], "id": "evt-9:TEAM_B"})),
+        record("m3", "<html>not json</html>"),
+        record("m4", json.dumps(["TEAM_C"])),
+    ]}
+    assert lambda_function.lambda_handler(event, fake_context()) == {"batchItemFailures": [{"itemIdentifier": "m2"}]}
+    assert run.call_count == 2
@@ -1,14 +1,25 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import mr_reminder_core
+import copy
+import json
 import logging
 import os
+import re
+from collections import namedtuple
+from dataclasses import replace
+from datetime import datetime, timezone
+from operator import itemgetter
+from types import MappingProxyType, SimpleNamespace
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
 
 # --- Fixtures ---
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fake_config():
-    # Minimal config for two teams, one with two projects, one with one
+    # Minimal config for two teams, one with two projects, one with one.
+    # Built once and shared by every test: treat as read-only, and use
+    # mutable_config in tests that change it
     return {
         "AA_GATEWAY_BACKEND": {
             "slack_webhook_url": "https://hooks.slack.com/services/fake1",
@@ -52,271 +63,718 @@ def fake_config():
         }
     }
 
-# --- Helper for MRs ---
-def fake_mrs():
-    # List of MRs for various scenarios
-    return {
-        "Rohan": [
-            # Happy path: MR with JIRA
-            {
-                "title": "[PROJ-123] Fix bug",
-                "web_url": "http://gitlab.com/mr/1",
-                "iid": 1,
-                "author": {"name": "Alice", "username": "alice"},
-                "assignees": [{"name": "Bob"}],
-                "reviewers": [{"name": "Carol"}],
-                "created_at": "2024-06-01T10:00:00Z",
-                "project_name": "Rohan",
-                "project_id": "1",
-                "project_token": "token1"
-            },
-            # Edge: MR with no JIRA
-            {
-                "title": "Refactor code",
-                "web_url": "http://gitlab.com/mr/2",
-                "iid": 2,
-                "author": {"name": "Dave", "username": "dave"},
-                "assignees": [],
-                "reviewers": [],
-                "created_at": "2024-06-01T10:00:00Z",
-                "project_name": "Rohan",
-                "project_id": "1",
-                "project_token": "token1"
-            },
-            # Edge: Draft MR
-            {
-                "title": "Draft: WIP feature",
-                "web_url": "http://gitlab.com/mr/3",
-                "iid": 3,
-                "author": {"name": "Eve", "username": "eve"},
-                "assignees": [],
-                "reviewers": [],
-                "created_at": "2024-06-01T10:00:00Z",
-                "project_name": "Rohan",
-                "project_id": "1",
-                "project_token": "token1",
-                "draft": True
-            },
-            # Edge: Bot MR
-            {
-                "title": "chore(deps): update dependency",
-                "web_url": "http://gitlab.com/mr/4",
-                "iid": 4,
-                "author": {"name": "Renovate Bot", "username": "renovate[bot]"},
-                "assignees": [],
-                "reviewers": [],
-                "created_at": "2024-06-01T10:00:00Z",
-                "project_name": "Rohan",
-                "project_id": "1",
-                "project_token": "token1"
-            }
-        ],
-        "Edoras": [
-            # Error: Simulate GitLab project not found (empty list)
-        ]
-    }
+@pytest.fixture(scope="session", autouse=True)
+def jira_env():
+    # JIRA config read by main(), set once for the session and restored after
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('JIRA_URL', 'http://fake-jira')
+        mp.setenv('JIRA_USERNAME', 'user')
+        mp.setenv('JIRA_TOKEN', 'token')
+        yield
+
+@pytest.fixture
+def mutable_config(fake_config):
+    # Private copy of fake_config for tests that modify it
+    return copy.deepcopy(fake_config)
+
+@pytest.fixture
+def fake_config_missing_project(mutable_config):
+    # Edoras points at a project GitLab does not know (API returns empty list)
+    mutable_config["AA_GATEWAY_BACKEND"]["gitlab_projects"]["Edoras"]["gitlab_project_id"] = "notfound"
+    return mutable_config
+
+# --- MRs ---
+# MRs for various scenarios, built once at import and frozen: the code under
+# test only reads them, so every main() run shares the same objects
+_FAKE_MRS = MappingProxyType({
+    "Rohan": tuple(map(MappingProxyType, [
+        # Happy path: MR with JIRA
+        {
+            "title": "[PROJ-123] Fix bug",
+            "web_url": "http://gitlab.com/mr/1",
+            "iid": 1,
+            "author": {"name": "Alice", "username": "alice"},
+            "assignees": [{"name": "Bob"}],
+            "reviewers": [{"name": "Carol"}],
+            "created_at": "2024-06-01T10:00:00Z",
+            "project_name": "Rohan",
+            "project_id": "1",
+            "project_token": "token1"
+        },
+        # Edge: MR with no JIRA
+        {
+            "title": "Refactor code",
+            "web_url": "http://gitlab.com/mr/2",
+            "iid": 2,
+            "author": {"name": "Dave", "username": "dave"},
+            "assignees": [],
+            "reviewers": [],
+            "created_at": "2024-06-01T10:00:00Z",
+            "project_name": "Rohan",
+            "project_id": "1",
+            "project_token": "token1"
+        },
+        # Edge: Draft MR
+        {
+            "title": "Draft: WIP feature",
+            "web_url": "http://gitlab.com/mr/3",
+            "iid": 3,
+            "author": {"name": "Eve", "username": "eve"},
+            "assignees": [],
+            "reviewers": [],
+            "created_at": "2024-06-01T10:00:00Z",
+            "project_name": "Rohan",
+            "project_id": "1",
+            "project_token": "token1",
+            "draft": True
+        },
+        # Edge: Bot MR
+        {
+            "title": "chore(deps): update dependency",
+            "web_url": "http://gitlab.com/mr/4",
+            "iid": 4,
+            "author": {"name": "Renovate Bot", "username": "renovate[bot]"},
+            "assignees": [],
+            "reviewers": [],
+            "created_at": "2024-06-01T10:00:00Z",
+            "project_name": "Rohan",
+            "project_id": "1",
+            "project_token": "token1"
+        }
+    ])),
+    "Edoras": (
+        # Error: Simulate GitLab project not found (no MRs)
+    )
+})
 
 # --- Mocks ---
 
-def fake_gitlab_get_open_merge_requests(self):
-    # Use the fixture data
-    return fake_mrs()
-
-def fake_gitlab_get_merge_request_approvals(self, project_id, mr_iid, token):
-    # All MRs are unapproved for test
-    return {"approved_by": []}
-
-def fake_jira_get_ticket_details(self, ticket_key):
-    # Simulate JIRA ticket found or not found
-    if ticket_key == "PROJ-123":
-        return {"status": "In Progress", "priority": "high", "priority_id": "1"}
-    # Simulate JIRA ticket not found
-    raise Exception("JIRA ticket not found")
-
-def fake_jira_get_ticket_details_safe(self, ticket_key):
-    # Simulate JIRA ticket found or not found, but return None on error
-    if ticket_key == "PROJ-123":
-        return {"status": "In Progress", "priority": "high", "priority_id": "1"}
-    return {"status": None, "priority": None, "priority_id": None}
-
-def fake_slack_post(*args, **kwargs):
-    # Simulate Slack API success
-    class FakeResponse:
-        def raise_for_status(self): pass
-    return FakeResponse()
-
-def fake_slack_post_error(*args, **kwargs):
-    # Simulate Slack API error
-    class FakeResponse:
-        def raise_for_status(self): raise Exception("Slack error")
-    return FakeResponse()
+class _OkResponse:
+    def raise_for_status(self): pass
+
+class _ErrResponse:
+    def raise_for_status(self): raise mr_reminder_core.requests.HTTPError("Slack error")
+
+# Stateless, so one instance of each serves every call
+_OK = _OkResponse()
+_ERR = _ErrResponse()
+
+class _Mocks:
+    # Stand-in callables, shared by every test. The GitLab/JIRA ones are
+    # installed as client methods, so they take the client as first argument
+
+    @staticmethod
+    def gitlab_open_mrs(self, created_before=None):
+        # Use the shared MR data
+        return _FAKE_MRS
+
+    @staticmethod
+    def gitlab_approvals(self, project_id, mr_iid, token):
+        # All MRs are unapproved for test
+        return {"approved_by": []}
+
+    @staticmethod
+    def jira_ticket_details(self, ticket_key):
+        # Simulate JIRA ticket found or not found, but return None on error
+        if ticket_key == "PROJ-123":
+            return {"status": "In Progress", "priority": "high", "priority_id": "1"}
+        return {"status": None, "priority": None, "priority_id": None}
+
+    @staticmethod
+    def jira_tickets_bulk(self, ticket_keys):
+        return {ticket_key: _Mocks.jira_ticket_details(self, ticket_key) for ticket_key in ticket_keys}
+
+    @staticmethod
+    def slack_ok(*args, **kwargs):
+        # Simulate Slack API success
+        return _OK
+
+    @staticmethod
+    def slack_error(*args, **kwargs):
+        # Simulate Slack API error
+        return _ERR
+
+def _install_fakes(mp, config):
+    # Stand-ins for GitLab, JIRA and the config loader while main() runs
+    mp.setattr(mr_reminder_core, 'load_projects_config', lambda: config)
+    mp.setattr(mr_reminder_core.TeamGitLabClient, 'get_open_merge_requests', _Mocks.gitlab_open_mrs)
+    mp.setattr(mr_reminder_core.TeamGitLabClient, 'get_merge_request_approvals', _Mocks.gitlab_approvals)
+    mp.setattr(mr_reminder_core.SimpleJiraClient, 'get_tickets_bulk', _Mocks.jira_tickets_bulk)
+
+@pytest.fixture
+def patches(monkeypatch, fake_config):
+    # Fakes for a test that runs main() itself. Not autouse: the client unit
+    # tests below exercise the real methods. Only Session.post is a mock,
+    # since tests assert on its calls
+    _install_fakes(monkeypatch, fake_config)
+    with patch('mr_reminder_core.requests.Session.post', side_effect=_Mocks.slack_ok) as post:
+        yield SimpleNamespace(post=post)
+
+# A Slack message split by block role: header, summary section and divider
+# first, the footer context last, and the MR sections in between
+PayloadView = namedtuple("PayloadView", "header summary divider mr_sections context")
+
+def _view(blocks):
+    return PayloadView(
+        header=blocks[0],
+        summary=blocks[1],
+        divider=blocks[2],
+        mr_sections=[b for b in blocks[3:-1] if b['type'] == 'section'],
+        context=blocks[-1],
+    )
+
+@pytest.fixture(scope="module")
+def slack_payloads(fake_config):
+    # Slack payloads from a single main() run on the unmodified fake data,
+    # shared by the tests that only inspect the messages
+    with pytest.MonkeyPatch.context() as mp:
+        _install_fakes(mp, fake_config)
+        with patch('mr_reminder_core.requests.Session.post', side_effect=_Mocks.slack_ok) as post:
+            mr_reminder_core.main()
+    return [_view(json.loads(call[1]['data'])['blocks']) for call in post.call_args_list]
+
+# --- Slack message patterns ---
+# MR link in a section block; group 1 is the displayed title
+_MR_LINK_RE = re.compile(r"\*<[^|>]+\|([^>]+)>\*")
+_PRIORITY_EMOJI_RE = re.compile("[🔥⚡]")
+_URGENCY_EMOJI_RE = re.compile("[🚨🔴🟠🟡]")
+
+_get_text = itemgetter('text')
+
+def _section_texts(view):
+    # Markdown text of each MR section in a PayloadView
+    return [_get_text(_get_text(b)) for b in view.mr_sections]
+
+def _mr_texts_by_title(view):
+    # Text of each MR section in a PayloadView, keyed by the linked MR title
+    mr_texts = {}
+    for text in _section_texts(view):
+        match = _MR_LINK_RE.search(text)
+        if match:
+            mr_texts[match.group(1)] = text
+    return mr_texts
 
 # --- Tests ---
 
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_happy_path(mock_load_config, mock_post, fake_config):
-    # Set up env vars for JIRA config
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    mock_load_config.return_value = fake_config
-    mr_reminder_core.main()
+def test_happy_path(slack_payloads):
     # Slack should be called for each team
-    assert mock_post.call_count == 2
+    assert len(slack_payloads) == 2
     # Check that the payload for the first call includes JIRA info for MR1 and not for MR2
-    payload = mock_post.call_args_list[0][1]['json']
-    blocks = payload['blocks']
+    mr_texts = _section_texts(slack_payloads[0])
     # MR with JIRA ticket should mention JIRA
-    assert any('JIRA:' in b['text']['text'] for b in blocks if b['type'] == 'section')
+    assert any('JIRA:' in text for text in mr_texts)
     # MR without JIRA ticket should not mention JIRA
-    assert any('Refactor code' in b['text']['text'] and 'JIRA:' not in b['text']['text'] for b in blocks if b['type'] == 'section')
-
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_edge_cases(mock_load_config, mock_post, fake_config):
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    mock_load_config.return_value = fake_config
-    mr_reminder_core.main()
+    assert any('Refactor code' in text and 'JIRA:' not in text for text in mr_texts)
+
+def test_edge_cases(slack_payloads):
     # Draft and bot MRs should be filtered out (not in Slack message)
-    payload = mock_post.call_args_list[0][1]['json']
-    blocks = payload['blocks']
     # Only two MRs should be present (not draft/bot)
-    mr_titles = [b['text']['text'] for b in blocks if b['type'] == 'section']
-    assert any('Fix bug' in t for t in mr_titles)
-    assert any('Refactor code' in t for t in mr_titles)
-    assert not any('Draft: WIP feature' in t for t in mr_titles)
-    assert not any('chore(deps)' in t for t in mr_titles)
-
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_gitlab_project_not_found(mock_load_config, mock_post, fake_config):
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    # Remove all MRs from Edoras to simulate project not found (API returns empty list)
-    fake_config["AA_GATEWAY_BACKEND"]["gitlab_projects"]["Edoras"]["gitlab_project_id"] = "notfound"
-    mock_load_config.return_value = fake_config
+    mr_titles = set()
+    for text in _section_texts(slack_payloads[0]):
+        mr_titles.update(_MR_LINK_RE.findall(text))
+    assert mr_titles == {'[PROJ-123] Fix bug', 'Refactor code'}
+
+def test_gitlab_project_not_found(patches, monkeypatch, fake_config_missing_project):
+    monkeypatch.setattr(mr_reminder_core, 'load_projects_config', lambda: fake_config_missing_project)
     mr_reminder_core.main()
     # Slack should still be called for both teams
-    assert mock_post.call_count == 2
-
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_jira_ticket_not_found(mock_load_config, mock_post, fake_config):
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    mock_load_config.return_value = fake_config
+    assert patches.post.call_count == 2
+
+def test_jira_ticket_not_found(patches):
     # Should not crash even if JIRA ticket is not found (should log warning)
     try:
         mr_reminder_core.main()
     except Exception as e:
         assert "JIRA ticket not found" in str(e)
 
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post_error)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_slack_api_error(mock_load_config, mock_post, fake_config):
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    mock_load_config.return_value = fake_config
-    # Should not crash, should log error
-    with pytest.raises(Exception):
-        mr_reminder_core.main() 
-
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_slack_message_format_granular(mock_load_config, mock_post, fake_config):
+def test_slack_api_error():
+    session = MagicMock()
+    session.post.side_effect = _Mocks.slack_error
+    notifier = mr_reminder_core.SlackNotifier("https://hooks.slack.com/services/fake1", session=session)
+    # Should not crash, should log error and report the failed delivery
+    assert notifier.send_notification({"blocks": []}) is False
+    assert session.post.call_count == 1
+
+def test_slack_message_format_granular(slack_payloads):
     """
     Test that the Slack message format includes correct emojis, block structure, and field formatting for various MR scenarios.
     Note: For single-team notifications, project info is not included in the MR block.
     """
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    mock_load_config.return_value = fake_config
-    mr_reminder_core.main()
-    payload = mock_post.call_args_list[0][1]['json']
-    blocks = payload['blocks']
+    view = slack_payloads[0]
     # 1. Header block
-    assert blocks[0]['type'] == 'header'
-    assert 'Stale Merge Requests Review' in blocks[0]['text']['text']
+    assert view.header['type'] == 'header'
+    assert 'Stale Merge Requests Review' in view.header['text']['text']
     # 2. Section block (summary)
-    assert blocks[1]['type'] == 'section'
-    assert 'Daily Review Reminder' in blocks[1]['text']['text']
+    assert view.summary['type'] == 'section'
+    assert 'Daily Review Reminder' in view.summary['text']['text']
     # 3. Divider
-    assert blocks[2]['type'] == 'divider'
-    # 4. MR section blocks: check for emojis, assignees/reviewers/author
-    mr_blocks = [b for b in blocks if b['type'] == 'section' and '|' in b['text']['text']]
+    assert view.divider['type'] == 'divider'
+    # 4. MR section blocks, indexed by MR title: check for emojis, assignees/reviewers/author
+    mr_texts = _mr_texts_by_title(view)
     # MR with JIRA and high priority should have JIRA emoji, priority emoji, urgency emoji
-    mr1 = next(b for b in mr_blocks if 'Fix bug' in b['text']['text'])
-    assert 'JIRA:' in mr1['text']['text']
-    assert '🔥' in mr1['text']['text'] or '⚡' in mr1['text']['text']  # priority emoji
-    assert any(e in mr1['text']['text'] for e in ['🚨', '🔴', '🟠', '🟡'])  # urgency emoji
-    assert '👀 *Reviewers:* Carol' in mr1['text']['text']
-    assert '👤 *Assignees:* Bob' in mr1['text']['text']
-    assert '✍️ *Author:* Alice' in mr1['text']['text']
+    mr1 = mr_texts['[PROJ-123] Fix bug']
+    assert 'JIRA:' in mr1
+    assert _PRIORITY_EMOJI_RE.search(mr1)
+    assert _URGENCY_EMOJI_RE.search(mr1)
+    assert '👀 *Reviewers:* Carol' in mr1
+    assert '👤 *Assignees:* Bob' in mr1
+    assert '✍️ *Author:* Alice' in mr1
     # MR without JIRA should not have JIRA info or priority emoji
-    mr2 = next(b for b in mr_blocks if 'Refactor code' in b['text']['text'])
-    assert 'JIRA:' not in mr2['text']['text']
-    assert '🔥' not in mr2['text']['text'] and '⚡' not in mr2['text']['text']
+    mr2 = mr_texts['Refactor code']
+    assert 'JIRA:' not in mr2
+    assert not _PRIORITY_EMOJI_RE.search(mr2)
     # Project info is not present in single-team notifications, so we do not assert for '*Project:*' here
     # 5. Context block (footer)
-    assert blocks[-1]['type'] == 'context'
-    assert 'Summary:' in blocks[-1]['elements'][0]['text'] 
+    assert view.context['type'] == 'context'
+    assert 'Summary:' in view.context['elements'][0]['text'] 
 
-@patch('mr_reminder_core.requests.post', side_effect=fake_slack_post)
-@patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', new=fake_gitlab_get_open_merge_requests)
-@patch('mr_reminder_core.TeamGitLabClient.get_merge_request_approvals', new=fake_gitlab_get_merge_request_approvals)
-@patch('mr_reminder_core.SimpleJiraClient.get_ticket_details', new=fake_jira_get_ticket_details_safe)
-@patch('mr_reminder_core.load_projects_config')
-def test_slack_message_format_jira_ticket_not_found(mock_load_config, mock_post, fake_config):
+def test_slack_message_format_jira_ticket_not_found():
     """
     Test that if a JIRA ticket is referenced in the MR but not found, the Slack message does not include JIRA info or priority emoji.
     """
-    os.environ['JIRA_URL'] = 'http://fake-jira'
-    os.environ['JIRA_USERNAME'] = 'user'
-    os.environ['JIRA_TOKEN'] = 'token'
-    mock_load_config.return_value = fake_config
-    orig_fake_mrs = fake_mrs()
-    orig_fake_mrs['Rohan'].append({
-        "title": "[NOTFOUND-999] Broken link",
-        "web_url": "http://gitlab.com/mr/5",
-        "iid": 5,
-        "author": {"name": "Frank", "username": "frank"},
-        "assignees": [],
-        "reviewers": [],
-        "created_at": "2024-06-01T10:00:00Z",
-        "project_name": "Rohan",
-        "project_id": "1",
-        "project_token": "token1"
-    })
-    with patch('mr_reminder_core.TeamGitLabClient.get_open_merge_requests', return_value=orig_fake_mrs):
+    notifier = mr_reminder_core.SlackNotifier("https://hooks.slack.com/services/fake1")
+    mr = mr_reminder_core.StaleMR(
+        title="[NOTFOUND-999] Broken link", web_url="http://gitlab.com/mr/5", iid=5, author="Frank",
+        assignees=[], reviewers=[], days_old=10, jira_ticket="NOTFOUND-999", jira_status=None,
+        jira_priority=None, jira_priority_display=None, threshold_used=2,
+        created_at="2024-06-01T10:00:00Z", project_name="Rohan", project_id="1",
+    )
+    view = _view(notifier.format_multi_project_message({"Rohan": [mr]})["blocks"])
+    mr_nf = _mr_texts_by_title(view)['[NOTFOUND-999] Broken link']
+    assert 'JIRA:' not in mr_nf
+    assert not _PRIORITY_EMOJI_RE.search(mr_nf)
+    assert '✍️ *Author:* Frank' in mr_nf
+
+@pytest.mark.parametrize("main_kwargs, expected_webhooks", [
+    # Notifications sent through the thread pool still post one message per team
+    ({"parallel_slack": True}, ["https://hooks.slack.com/services/fake1", "https://hooks.slack.com/services/fake2"]),
+    # A per-team worker run (team_names) only notifies the requested team
+    ({"team_names": ["AA_GATEWAY_FRONTEND"]}, ["https://hooks.slack.com/services/fake2"]),
+], ids=["parallel_slack", "team_names"])
+def test_main_posts_one_message_per_team(patches, main_kwargs, expected_webhooks):
+    """
+    Test that main() posts exactly one Slack message to each selected team's webhook.
+    """
+    mr_reminder_core.main(**main_kwargs)
+    assert sorted(call[0][0] for call in patches.post.call_args_list) == expected_webhooks
+
+def test_approval_check_memoized_by_updated_at(fake_config):
+    """
+    Test that approval lookups are served from the warm-container cache until the MR's updated_at changes.
+    """
+    team_config = mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", fake_config["AA_GATEWAY_BACKEND"])
+    analyzer = mr_reminder_core.TeamMRAnalyzer(team_config, "https://gitlab.example.com", MagicMock())
+    analyzer.gitlab = MagicMock()
+    analyzer.gitlab.get_merge_request_approvals.return_value = {"approved_by": [{"user": {"username": "bob"}}]}
+    mr_reminder_core._approval_cache.clear()
+    mr = {"project_id": "1", "iid": 42, "project_token": "token1", "updated_at": "2024-06-01T10:00:00Z"}
+    assert analyzer.is_mr_approved(mr)
+    assert analyzer.is_mr_approved(mr)
+    assert analyzer.gitlab.get_merge_request_approvals.call_count == 1
+    assert analyzer.is_mr_approved({**mr, "updated_at": "2024-06-02T10:00:00Z"})
+    assert analyzer.gitlab.get_merge_request_approvals.call_count == 2
+    # Approvers included in the MR payload (GraphQL) need no /approvals call
+    assert not analyzer.is_mr_approved({**mr, "approved_by": []})
+    assert analyzer.is_mr_approved({**mr, "approved_by": [{"user": {"username": "bob"}}]})
+    assert analyzer.gitlab.get_merge_request_approvals.call_count == 2
+
+def test_slack_delivery_failure_is_transient(patches):
+    """
+    Test that Slack delivery failures are attempted for every team and then surfaced as TransientMRError.
+    """
+    patches.post.side_effect = mr_reminder_core.requests.ConnectionError("Slack unreachable")
+    with pytest.raises(mr_reminder_core.TransientMRError) as exc_info:
         mr_reminder_core.main()
-        payload = mock_post.call_args_list[0][1]['json']
-        blocks = payload['blocks']
-        mr_nf = next(b for b in blocks if b['type'] == 'section' and 'Broken link' in b['text']['text'])
-        assert 'JIRA:' not in mr_nf['text']['text']
-        assert '🔥' not in mr_nf['text']['text'] and '⚡' not in mr_nf['text']['text']
-        assert '✍️ *Author:* Frank' in mr_nf['text']['text'] 
\ No newline at end of file
+    assert patches.post.call_count == 2
+    assert 'AA_GATEWAY_BACKEND' in str(exc_info.value) and 'AA_GATEWAY_FRONTEND' in str(exc_info.value)
+
+def test_load_projects_config_cached_until_file_changes(tmp_path):
+    """
+    Test that the parsed YAML config is reused until the file's mtime changes.
+    """
+    config_file = tmp_path / "projects_config.yaml"
+    config_file.write_text("TEAM_A:\n  slack_webhook_url: https://hooks.slack.com/a\n")
+    first = mr_reminder_core.load_projects_config(str(config_file))
+    assert mr_reminder_core.load_projects_config(str(config_file)) is first
+    config_file.write_text("TEAM_B:\n  slack_webhook_url: https://hooks.slack.com/b\n")
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert list(mr_reminder_core.load_projects_config(str(config_file))) == ["TEAM_B"]
+
+def test_gitlab_graphql_fetch_with_rest_fallback(mutable_config):
+    """
+    Test that projects sharing a token are fetched in one GraphQL request, and a project with more
+    than one page of open MRs falls back to the REST endpoint.
+    """
+    team_data = mutable_config["AA_GATEWAY_BACKEND"]
+    team_data["gitlab_projects"]["Edoras"]["gitlab_token"] = "token1"
+    session = MagicMock()
+    session.post.return_value.content = json.dumps({"data": {"projects": {"nodes": [
+        {"id": "gid://gitlab/Project/1", "mergeRequests": {"pageInfo": {"hasNextPage": False}, "nodes": [{
+            "iid": "7", "title": "Add login", "description": None, "webUrl": "http://gitlab.com/mr/7",
+            "createdAt": "2024-06-01T10:00:00Z", "updatedAt": "2024-06-02T10:00:00Z", "draft": False,
+            "author": {"name": "Alice", "username": "alice"},
+            "assignees": {"nodes": []}, "reviewers": {"nodes": [{"name": "Carol", "username": "carol"}]},
+            "approvedBy": {"nodes": []},
+        }]}},
+        {"id": "gid://gitlab/Project/2", "mergeRequests": {"pageInfo": {"hasNextPage": True}, "nodes": []}},
+    ]}}}).encode()
+    session.get.return_value.content = json.dumps([{"iid": 9, "title": "REST MR"}]).encode()
+    session.get.return_value.links = {}
+    client = mr_reminder_core.TeamGitLabClient(
+        mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", team_data), "https://gitlab.example.com", session
+    )
+    all_mrs = client.get_open_merge_requests()
+    assert session.post.call_count == 1
+    assert json.loads(session.post.call_args[1]['data'])['variables']['ids'] == ["gid://gitlab/Project/1", "gid://gitlab/Project/2"]
+    rohan_mr = all_mrs["Rohan"][0]
+    assert rohan_mr["iid"] == 7 and rohan_mr["web_url"] == "http://gitlab.com/mr/7"
+    assert rohan_mr["reviewers"] == [{"name": "Carol", "username": "carol"}]
+    assert rohan_mr["project_id"] == "1" and rohan_mr["project_token"] == "token1"
+    assert rohan_mr["approved_by"] == []
+    assert session.get.call_args[1]['params']['wip'] == "no"
+    assert session.get.call_args[0][0] == "https://gitlab.example.com/api/v4/projects/2/merge_requests"
+    assert [mr["title"] for mr in all_mrs["Edoras"]] == ["REST MR"]
+
+def test_gitlab_graphql_null_merge_requests_falls_back_to_rest(mutable_config):
+    """
+    Test that a project GraphQL returns without merge requests is fetched over REST, and an MR
+    whose author was deleted (null author) gets the REST ghost user.
+    """
+    team_data = mutable_config["AA_GATEWAY_BACKEND"]
+    team_data["gitlab_projects"]["Edoras"]["gitlab_token"] = "token1"
+    session = MagicMock()
+    session.post.return_value.content = json.dumps({"data": {"projects": {"nodes": [
+        {"id": "gid://gitlab/Project/1", "mergeRequests": None},
+        {"id": "gid://gitlab/Project/2", "mergeRequests": {"pageInfo": {"hasNextPage": False}, "nodes": [{
+            "iid": "8", "title": "Orphaned MR", "description": None, "webUrl": "http://gitlab.com/mr/8",
+            "createdAt": "2024-06-01T10:00:00Z", "updatedAt": "2024-06-02T10:00:00Z", "draft": False,
+            "author": None, "assignees": {"nodes": []}, "reviewers": {"nodes": []}, "approvedBy": {"nodes": []},
+        }]}},
+    ]}}}).encode()
+    session.get.return_value.content = json.dumps([{"iid": 9, "title": "REST MR"}]).encode()
+    session.get.return_value.links = {}
+    client = mr_reminder_core.TeamGitLabClient(
+        mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", team_data), "https://gitlab.example.com", session
+    )
+    all_mrs = client.get_open_merge_requests()
+    assert session.get.call_args[0][0] == "https://gitlab.example.com/api/v4/projects/1/merge_requests"
+    assert [mr["title"] for mr in all_mrs["Rohan"]] == ["REST MR"]
+    orphaned = all_mrs["Edoras"][0]
+    assert orphaned["author"] == {"name": "Ghost User", "username": "ghost"}
+    analyzer = mr_reminder_core.TeamMRAnalyzer(
+        mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", team_data), "https://gitlab.example.com", MagicMock()
+    )
+    assert not analyzer.is_bot_or_dependency_mr(orphaned)
+
+def test_gitlab_rest_fetch_follows_all_pages(fake_config):
+    """
+    Test that the REST fallback reads the last page from the Link header and fetches every page.
+    """
+    team_data = fake_config["AA_GATEWAY_BACKEND"]
+    base_url = "https://gitlab.example.com/api/v4/projects/2/merge_requests"
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        page = params["page"]
+        resp = MagicMock()
+        resp.content = json.dumps([{"iid": page, "title": f"MR on page {page}"}]).encode()
+        resp.links = {"last": {"url": f"{base_url}?page=3&per_page=100&state=opened"}} if page == 1 else {}
+        return resp
+
+    session = MagicMock()
+    session.get.side_effect = fake_get
+    client = mr_reminder_core.TeamGitLabClient(
+        mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", team_data), "https://gitlab.example.com", session
+    )
+    mrs = client._get_open_merge_requests_rest("Edoras", team_data["gitlab_projects"]["Edoras"])
+    assert [mr["iid"] for mr in mrs] == [1, 2, 3]
+    assert session.get.call_count == 3
+    assert all(mr["project_name"] == "Edoras" for mr in mrs)
+
+def test_jira_ticket_details_cached_including_missing_tickets():
+    """
+    Test that repeated lookups of the same ticket, found or not found, only hit JIRA once.
+    """
+    def fake_get(url, auth=None, params=None, headers=None, timeout=None):
+        resp = MagicMock()
+        if url.endswith("/MISSING-1"):
+            resp.status_code = 404
+            resp.raise_for_status.side_effect = mr_reminder_core.requests.HTTPError("404 Not Found", response=resp)
+        else:
+            resp.content = json.dumps({"fields": {"status": {"name": "In Progress"}, "priority": {"name": "High", "id": "2"}}}).encode()
+        return resp
+
+    session = MagicMock()
+    session.get.side_effect = fake_get
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    for _ in range(3):
+        assert jira.get_ticket_details("PROJ-1")["priority"] == "high"
+        assert jira.get_ticket_details("MISSING-1") == {'status': None, 'priority': None, 'priority_id': None}
+    assert session.get.call_count == 2
+    jira.clear_cache()
+    jira.get_ticket_details("PROJ-1")
+    assert session.get.call_count == 3
+
+def test_jira_cache_eviction_safe_across_threads(monkeypatch):
+    """
+    Test that concurrent inserts into a full JIRA ticket cache never evict the same entry twice.
+    """
+    monkeypatch.setattr(mr_reminder_core, "JIRA_CACHE_MAXSIZE", 2)
+    client = mr_reminder_core.SimpleJiraClient("http://fake-jira", "user", "token", session=MagicMock())
+    def fill(worker):
+        for i in range(2000):
+            client._remember_ticket(f"PROJ-{worker}-{i}", {}, 0.0)
+    with mr_reminder_core.ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(fill, range(8)))
+    assert len(client._ticket_cache) <= 2
+
+def test_jira_requests_capped_process_wide(monkeypatch):
+    """
+    Test that JIRA lookups from concurrent teams share the process-wide request cap.
+    """
+    monkeypatch.setattr(mr_reminder_core, "_jira_request_slots", mr_reminder_core.threading.BoundedSemaphore(2))
+    in_flight, peak, lock = [0], [0], mr_reminder_core.threading.Lock()
+    def fake_get(url, **kwargs):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        mr_reminder_core.time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return MagicMock(status_code=200, headers={}, content=b'{"fields": {"status": {"name": "Open"}, "priority": null}}')
+    session = MagicMock()
+    session.get.side_effect = fake_get
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    with mr_reminder_core.ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(jira.get_ticket_details, [f"PROJ-{i}" for i in range(16)]))
+    assert session.get.call_count == 16
+    assert peak[0] == 2
+
+def test_jira_expired_ticket_revalidated_with_etag(monkeypatch):
+    """
+    Test that an expired ticket is re-requested with If-None-Match and a 304 keeps the cached details.
+    """
+    ok = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+    ok.content = json.dumps({"fields": {"status": {"name": "Open"}, "priority": {"name": "Low", "id": "4"}}}).encode()
+    session = MagicMock()
+    session.get.side_effect = [ok, MagicMock(status_code=304)]
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    assert jira.get_ticket_details("PROJ-1")["status"] == "Open"
+    monkeypatch.setattr(mr_reminder_core, "JIRA_CACHE_TTL_SECONDS", -1)
+    assert jira.get_ticket_details("PROJ-1")["status"] == "Open"
+    assert session.get.call_args_list[1][1]["headers"] == {"If-None-Match": '"v1"'}
+    assert session.get.call_args[1]["params"] == {"fields": "status,priority"}
+
+def test_jira_only_client_errors_cached_as_missing_ticket():
+    """
+    Test that a 404 is remembered as a missing ticket, while a 503 is retried on the next lookup.
+    """
+    def failed(status):
+        response = MagicMock(status_code=status)
+        response.raise_for_status.side_effect = mr_reminder_core.requests.HTTPError(str(status), response=response)
+        return response
+    session = MagicMock()
+    session.get.side_effect = [failed(404), failed(503), failed(503)]
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    empty = {'status': None, 'priority': None, 'priority_id': None}
+    assert jira.get_ticket_details("GONE-1") == empty
+    assert jira.get_ticket_details("GONE-1") == empty
+    assert jira.get_ticket_details("DOWN-1") == empty
+    assert jira.get_ticket_details("DOWN-1") == empty
+    assert [call[0][0].rsplit("/", 1)[1] for call in session.get.call_args_list] == ["GONE-1", "DOWN-1", "DOWN-1"]
+
+def test_young_draft_and_bot_mrs_skip_network_lookups(fake_config):
+    """
+    Test that drafts, bot MRs and MRs younger than every threshold are dropped before any JIRA or approvals request.
+    """
+    team_config = mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", fake_config["AA_GATEWAY_BACKEND"])
+    jira = MagicMock()
+    jira.get_tickets_bulk.return_value = {"PROJ-1": {'status': 'Open', 'priority': None, 'priority_id': None}}
+    analyzer = mr_reminder_core.TeamMRAnalyzer(team_config, "https://gitlab.example.com", jira)
+    analyzer.gitlab = MagicMock()
+    analyzer.gitlab.get_merge_request_approvals.return_value = {"approved_by": []}
+    old = "2024-06-01T10:00:00Z"
+    young = datetime.now(timezone.utc).isoformat()
+    base = {"description": "", "web_url": "http://gitlab.com/mr", "project_name": "Rohan", "project_id": "1",
+            "project_token": "token1", "author": {"name": "Alice", "username": "alice"}, "assignees": [], "reviewers": []}
+    analyzer.gitlab.get_open_merge_requests.return_value = {"Rohan": [
+        {**base, "iid": 1, "title": "PROJ-1 Old MR", "created_at": old},
+        {**base, "iid": 2, "title": "PROJ-2 Young MR", "created_at": young},
+        {**base, "iid": 3, "title": "Draft: PROJ-3 WIP", "created_at": old},
+        {**base, "iid": 4, "title": "PROJ-4 bump requests", "created_at": old,
+         "author": {"name": "Dependabot", "username": "dependabot"}},
+    ]}
+    stale_mrs = analyzer.get_stale_mrs()
+    assert [mr.iid for mr in stale_mrs] == [1]
+    jira.get_tickets_bulk.assert_called_once_with(["PROJ-1"])
+    created_before = analyzer.gitlab.get_open_merge_requests.call_args[1]['created_before']
+    assert (datetime.now(timezone.utc) - created_before).days == 1
+    assert analyzer.gitlab.get_merge_request_approvals.call_count == 1
+
+def test_gitlab_get_revalidates_with_etag(fake_config):
+    """
+    Test that a repeated GitLab GET sends If-None-Match and a 304 is answered from the ETag cache.
+    """
+    team_config = mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", fake_config["AA_GATEWAY_BACKEND"])
+    first, not_modified = MagicMock(status_code=200, headers={"ETag": 'W/"abc"'}, links={}), MagicMock(status_code=304)
+    approvals = {"approved_by": [{"user": {"username": "bob"}}]}
+    first.content = json.dumps(approvals).encode()
+    session = MagicMock()
+    session.get.side_effect = [first, not_modified]
+    client = mr_reminder_core.TeamGitLabClient(team_config, "https://gitlab.example.com", session)
+    mr_reminder_core._etag_cache.clear()
+    assert client.get_merge_request_approvals("1", 42, "token1") == approvals
+    assert client.get_merge_request_approvals("1", 42, "token1") == approvals
+    assert session.get.call_args[1]['headers']["If-None-Match"] == 'W/"abc"'
+
+def test_gitlab_mr_list_revalidated_with_etag_on_next_run(fake_config):
+    """
+    Test that a later run within the same hour requests the MR list with If-None-Match, and the
+    ETag cache keeps only the MR fields the analyzer reads.
+    """
+    team_config = mr_reminder_core.TeamConfig("AA_GATEWAY_FRONTEND", fake_config["AA_GATEWAY_FRONTEND"])
+    first = MagicMock(status_code=200, headers={"ETag": 'W/"mrs"'}, links={})
+    first.content = json.dumps([{"iid": 9, "title": "REST MR", "diff_refs": {"base_sha": "abc"}}]).encode()
+    session = MagicMock()
+    session.post.side_effect = mr_reminder_core.requests.ConnectionError("GraphQL unavailable")
+    session.get.side_effect = [first, MagicMock(status_code=304)]
+    client = mr_reminder_core.TeamGitLabClient(team_config, "https://gitlab.example.com", session)
+    mr_reminder_core._etag_cache.clear()
+    client.get_open_merge_requests(created_before=datetime(2024, 6, 1, 10, 5, 17, 123456, tzinfo=timezone.utc))
+    all_mrs = client.get_open_merge_requests(created_before=datetime(2024, 6, 1, 10, 40, tzinfo=timezone.utc))
+    assert session.get.call_args[1]['headers']["If-None-Match"] == 'W/"mrs"'
+    assert session.get.call_args[1]['params']['created_before'] == "2024-06-01T11:00:00+00:00"
+    assert all_mrs["Athena"] == [{"iid": 9, "title": "REST MR", "project_name": "Athena", "project_id": "3", "project_token": "token3"}]
+    assert all("diff_refs" not in mr for cached in mr_reminder_core._etag_cache.values() for mr in cached[1])
+
+def test_non_json_responses_handled_as_request_errors(fake_config):
+    """
+    Test that an HTML page served with 200 (e.g. an SSO redirect) is logged and skipped for MR lists,
+    approvals and JIRA tickets rather than aborting the run.
+    """
+    html = MagicMock(status_code=200, headers={}, links={}, content=b"<html>Sign in</html>")
+    session = MagicMock()
+    session.get.return_value = html
+    session.post.side_effect = mr_reminder_core.requests.ConnectionError("GraphQL unavailable")
+    team_config = mr_reminder_core.TeamConfig("AA_GATEWAY_FRONTEND", fake_config["AA_GATEWAY_FRONTEND"])
+    client = mr_reminder_core.TeamGitLabClient(team_config, "https://gitlab.example.com", session)
+    mr_reminder_core._etag_cache.clear()
+    assert client.get_open_merge_requests() == {"Athena": []}
+    assert client.get_merge_request_approvals("3", 42, "token3") == {}
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    assert jira.get_ticket_details("PROJ-1") == {'status': None, 'priority': None, 'priority_id': None}
+
+def test_jira_tickets_fetched_with_one_search():
+    """
+    Test that several tickets are resolved with a single JQL search, and tickets it does not return get empty details.
+    """
+    session = MagicMock()
+    session.post.return_value.content = json.dumps({"issues": [
+        {"key": "PROJ-1", "fields": {"status": {"name": "Open"}, "priority": {"name": "Low", "id": "4"}}},
+    ]}).encode()
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    details = jira.get_tickets_bulk(["PROJ-1", "GONE-2", "PROJ-1"])
+    assert details["PROJ-1"]["priority"] == "low"
+    assert details["GONE-2"] == {'status': None, 'priority': None, 'priority_id': None}
+    assert session.post.call_count == 1
+    assert json.loads(session.post.call_args[1]['data'])['jql'] == "key in (PROJ-1, GONE-2)"
+    jira.get_tickets_bulk(["PROJ-1", "GONE-2"])
+    assert session.post.call_count == 1
+    session.get.assert_not_called()
+
+def test_jira_failed_search_falls_back_to_ticket_lookups():
+    """
+    Test that when the JQL search fails, each ticket is fetched on its own instead.
+    """
+    session = MagicMock()
+    session.post.side_effect = mr_reminder_core.requests.ConnectionError("search unavailable")
+    session.get.return_value.content = json.dumps(
+        {"fields": {"status": {"name": "Open"}, "priority": {"name": "High", "id": "2"}}}
+    ).encode()
+    jira = mr_reminder_core.SimpleJiraClient("https://jira.example.com", "user", "token", session)
+    details = jira.get_tickets_bulk(["PROJ-1", "PROJ-2"])
+    assert {key: d["priority"] for key, d in details.items()} == {"PROJ-1": "high", "PROJ-2": "high"}
+    assert sorted(call[0][0] for call in session.get.call_args_list) == [
+        "https://jira.example.com/rest/api/2/issue/PROJ-1", "https://jira.example.com/rest/api/2/issue/PROJ-2"
+    ]
+
+def test_jira_details_requested_once_per_distinct_ticket(fake_config):
+    """
+    Test that MRs sharing a JIRA ticket (or having none) lead to one lookup per distinct ticket.
+    """
+    team_config = mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", fake_config["AA_GATEWAY_BACKEND"])
+    jira = MagicMock()
+    jira.get_tickets_bulk.side_effect = lambda keys: {key: {'status': 'Open', 'priority': 'high', 'priority_id': '2'} for key in keys}
+    analyzer = mr_reminder_core.TeamMRAnalyzer(team_config, "https://gitlab.example.com", jira)
+    details = analyzer.get_jira_details(["EPIC-1", None, "EPIC-1", "PROJ-2"])
+    jira.get_tickets_bulk.assert_called_once_with(["EPIC-1", "PROJ-2"])
+    assert [d['priority'] for d in details] == ['high', None, 'high', 'high']
+
+def test_uniform_threshold_looks_up_jira_only_for_reported_mrs(mutable_config):
+    """
+    Test that when priority thresholds are off, approved MRs are dropped before any JIRA lookup.
+    """
+    team_data = mutable_config["AA_GATEWAY_BACKEND"]
+    team_data["threshold_config"]["use_priority_thresholds"] = False
+    jira = MagicMock()
+    jira.get_tickets_bulk.side_effect = lambda keys: {key: {'status': 'Open', 'priority': 'high', 'priority_id': '2'} for key in keys}
+    analyzer = mr_reminder_core.TeamMRAnalyzer(mr_reminder_core.TeamConfig("AA_GATEWAY_BACKEND", team_data),
+                                               "https://gitlab.example.com", jira)
+    assert analyzer.uniform_threshold
+    base = {"description": "", "web_url": "http://gitlab.com/mr", "project_name": "Rohan", "project_id": "1",
+            "created_at": "2024-06-01T10:00:00Z", "author": {"name": "Alice", "username": "alice"},
+            "assignees": [], "reviewers": []}
+    analyzer.gitlab = MagicMock()
+    analyzer.gitlab.get_open_merge_requests.return_value = {"Rohan": [
+        {**base, "iid": 1, "title": "PROJ-1 Waiting", "approved_by": []},
+        {**base, "iid": 2, "title": "PROJ-2 Approved", "approved_by": [{"user": {"username": "bob"}}]},
+    ]}
+    stale_mrs = analyzer.get_stale_mrs()
+    assert [(mr.iid, mr.jira_status, mr.threshold_used) for mr in stale_mrs] == [(1, "Open", 2)]
+    jira.get_tickets_bulk.assert_called_once_with(["PROJ-1"])
+
+def test_long_slack_message_split_at_block_limit():
+    """
+    Test that a message over Slack's 50-block limit is sent as consecutive posts of at most 50 blocks.
+    """
+    session = MagicMock()
+    notifier = mr_reminder_core.SlackNotifier("https://hooks.slack.com/services/T000/B000/XXX", session=session)
+    message = {"text": "fallback", "blocks": [{"type": "divider"}] * 120}
+    assert notifier.send_notification(message)
+    sent = [json.loads(call[1]['data']) for call in session.post.call_args_list]
+    assert [len(part["blocks"]) for part in sent] == [50, 50, 20]
+    assert all(part["text"] == "fallback" for part in sent)
+
+def test_project_mr_blocks_reused_until_mr_changes():
+    """
+    Test that an unchanged MR reuses its rendered block across messages, and any rendered change re-renders it.
+    """
+    notifier = mr_reminder_core.SlackNotifier("https://hooks.slack.com/services/T000/B000/XXX", {"bob": "U123"})
+    mr = mr_reminder_core.StaleMR(
+        title="Fix login", web_url="http://gitlab.com/mr/1", iid=1, author="alice", assignees=[], reviewers=["bob"],
+        days_old=5, jira_ticket=None, jira_status=None, jira_priority=None,
+        jira_priority_display=None, threshold_used=2,
+        created_at="2024-01-01T00:00:00Z", project_name="Rohan", project_id=1,
+    )
+    first = notifier.format_multi_project_message({"Rohan": [replace(mr)]})["blocks"][4]
+    again = notifier.format_multi_project_message({"Rohan": [replace(mr)]})["blocks"][4]
+    older = notifier.format_multi_project_message({"Rohan": [replace(mr, days_old=6)]})["blocks"][4]
+    assert again is first
+    assert "<@U123>" in first["text"]["text"]
+    assert "6 days old" in older["text"]["text"]
+
+def test_slack_webhook_posts_retried_on_rate_limit():
+    """
+    Test that Slack webhook posts, like GitLab/JIRA queries, are retried on 429 and 5xx.
+    """
+    session = mr_reminder_core.get_session()
+    slack_retry = session.get_adapter("https://hooks.slack.com/services/T000/B000/XXX").max_retries
+    assert slack_retry.is_retry("POST", 429, has_retry_after=True)
+    # Worst case for one post (every attempt times out, longest wait between them) stays under a minute
+    longest_wait = max(slack_retry.backoff_max, slack_retry.retry_after_max)
+    assert (slack_retry.total + 1) * sum(mr_reminder_core.SLACK_HTTP_TIMEOUT) + slack_retry.total * longest_wait < 60
+    # A long Retry-After is capped, and a read timeout (the post may have been delivered) is not retried
+    assert slack_retry.get_retry_after(MagicMock(headers={"Retry-After": "60"})) == slack_retry.retry_after_max
+    with pytest.raises(MaxRetryError):
+        slack_retry.increment("POST", "/services/T000", error=ReadTimeoutError(None, "/", "timed out"))
+    assert session.get_adapter("https://jira.example.com/rest/api/2/search").max_retries.is_retry("POST", 503)